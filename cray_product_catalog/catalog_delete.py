@@ -2,7 +2,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2021-2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2021-2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -37,28 +37,25 @@ If a 'key' is not specified:
 {PRODUCT}:
   {PRODUCT_VERSION}: # <- delete entire version
 
-Since updates to a ConfigMap are not atomic, this script will continue to
-attempt to modify the ConfigMap until it has been patched successfully.
+Since updates to a ConfigMap are not atomic, this script will retry the
+modification if it conflicts with an update made by another process.
 """
 
 import logging
 import os
-import random
-import time
 import urllib3
-from urllib3.util.retry import Retry
 
-from kubernetes import client
-from kubernetes.client.api_client import ApiClient
 from kubernetes.client.rest import ApiException
-import yaml
 
 from cray_product_catalog.logging import configure_logging
 from cray_product_catalog.util import load_k8s
+from cray_product_catalog.util.k8s import get_core_v1_api, retry_on_conflict, wait_for_config_map
 from cray_product_catalog.util.catalog_data_helper import format_product_cm_name
+from cray_product_catalog.util.yaml_helper import dump_yaml, load_yaml
 from cray_product_catalog.constants import (
     CONFIG_MAP_FIELDS,
     PRODUCT_CM_FIELDS,
+    PRODUCT_CATALOG_FIELD_MANAGER,
 )
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -78,117 +75,49 @@ class ModifyConfigMapUtil:
     """Utility class to manage the ConfigMap modification
     """
 
+    __slots__ = (
+        'main_cm',
+        'product_cm',
+        'cm_namespace',
+        'product_name',
+        'product_version',
+        'max_retries_for_main_cm',
+        'max_retries_for_prod_cm',
+        'key',
+        'main_cm_fields',
+        'product_cm_fields',
+    )
+
     def __init__(self):
-        self.__main_cm = None
-        self.__product_cm = None
-        self.__cm_namespace = None
-        self.__product_name = None
-        self.__product_version = None
-        self.__max_retries_for_main_cm = None
-        self.__max_retries_for_prod_cm = None
-        self.__key = None
-        self.__main_cm_fields = None
-        self.__product_cm_fields = None
-
-    # property definitions
-    @property
-    def main_cm(self):
-        return self.__main_cm
-
-    @main_cm.setter
-    def main_cm(self, __main_cm):
-        self.__main_cm = __main_cm
-
-    @property
-    def product_cm(self):
-        return self.__product_cm
-
-    @product_cm.setter
-    def product_cm(self, __product_cm):
-        self.__product_cm = __product_cm
-
-    @property
-    def cm_namespace(self):
-        return self.__cm_namespace
-
-    @cm_namespace.setter
-    def cm_namespace(self, __cm_namespace):
-        self.__cm_namespace = __cm_namespace
-
-    @property
-    def product_name(self):
-        return self.__product_name
-
-    @product_name.setter
-    def product_name(self, __product_name):
-        self.__product_name = __product_name
-
-    @property
-    def product_version(self):
-        return self.__product_version
-
-    @product_version.setter
-    def product_version(self, __product_version):
-        self.__product_version = __product_version
-
-    @property
-    def max_retries_for_main_cm(self):
-        return self.__max_retries_for_main_cm
-
-    @max_retries_for_main_cm.setter
-    def max_retries_for_main_cm(self, __max_retries_for_main_cm):
-        self.__max_retries_for_main_cm = __max_retries_for_main_cm
-
-    @property
-    def max_retries_for_prod_cm(self):
-        return self.__max_retries_for_prod_cm
-
-    @max_retries_for_prod_cm.setter
-    def max_retries_for_prod_cm(self, __max_retries_for_prod_cm):
-        self.__max_retries_for_prod_cm = __max_retries_for_prod_cm
-
-    @property
-    def key(self):
-        return self.__key
-
-    @key.setter
-    def key(self, __key):
-        self.__key = __key
-
-    @property
-    def main_cm_fields(self):
-        return self.__main_cm_fields
-
-    @main_cm_fields.setter
-    def main_cm_fields(self, __main_cm_fields):
-        self.__main_cm_fields = __main_cm_fields
-
-    @property
-    def product_cm_fields(self):
-        return self.__product_cm_fields
-
-    @product_cm_fields.setter
-    def product_cm_fields(self, __product_cm_fields):
-        self.__product_cm_fields = __product_cm_fields
+        self.main_cm = None
+        self.product_cm = None
+        self.cm_namespace = None
+        self.product_name = None
+        self.product_version = None
+        self.max_retries_for_main_cm = None
+        self.max_retries_for_prod_cm = None
+        self.key = None
+        self.main_cm_fields = None
+        self.product_cm_fields = None
 
     # private methods
     def __key_belongs_to_main_cm_fields(self):
-        return self.__key in self.__main_cm_fields
+        return self.key in self.main_cm_fields
 
     def __key_belongs_to_prod_cm_fields(self):
-        return self.__key in self.__product_cm_fields
+        return self.key in self.product_cm_fields
 
     def __modify_main_cm(self):
         LOGGER.info("Removing from config_map=%s in namespace=%s for %s/%s (key=%s)",
                     self.main_cm, self.cm_namespace, self.product_name, self.product_version, self.key)
-        modify_config_map(self.__main_cm, self.__cm_namespace, self.__product_name, self.__product_version,
-                          self.__key, self.__max_retries_for_main_cm, )
+        modify_config_map(self.main_cm, self.cm_namespace, self.product_name, self.product_version,
+                          self.key, self.max_retries_for_main_cm, )
 
     def __modify_product_cm(self):
         LOGGER.info("Removing from config_map=%s in namespace=%s for %s/%s (key=%s)",
                     self.product_cm, self.cm_namespace, self.product_name, self.product_version, self.key)
-        modify_config_map(self.__product_cm, self.__cm_namespace, self.__product_name, self.__product_version,
-                          self.__key, self.__max_retries_for_prod_cm, )
+        modify_config_map(self.product_cm, self.cm_namespace, self.product_name, self.product_version,
+                          self.key, self.max_retries_for_prod_cm, )
 
     # public method
     def modify(self):
@@ -206,7 +135,7 @@ class ModifyConfigMapUtil:
         *    main_cm_fields  # Fields present in main ConfigMap
         *    product_cm_fields  # Fields present in product-specific ConfigMap
         """
-        if self.__key:
+        if self.key:
             if self.__key_belongs_to_main_cm_fields():
                 self.__modify_main_cm()
 
@@ -224,11 +153,10 @@ class ModifyConfigMapUtil:
 
         # Before attempting to delete a ConfigMap, first verify if for the product there is a product_cm present or not.
         # If not, give a warning message and continue
-        k8sclient = ApiClient()
-        name = self.__product_cm
-        namespace = self.__cm_namespace
-        product_name = self.__product_name
-        api_instance = client.CoreV1Api(k8sclient)
+        name = self.product_cm
+        namespace = self.cm_namespace
+        product_name = self.product_name
+        api_instance = get_core_v1_api()
         try:
             response = api_instance.read_namespaced_config_map(name, namespace)
             self.__modify_product_cm()
@@ -243,107 +171,118 @@ class ModifyConfigMapUtil:
             raise
 
 
-def modify_config_map(name, namespace, product, product_version, key=None, max_attempts=MAX_RETRIES):
-    """Remove a product version from the catalog ConfigMap.
-
-    If a key is specified, delete the `key` content from a specific section
-    of the catalog ConfigMap. If there are no more keys after it has been
-    removed, remove the version mapping as well.
-
-    1. Wait for the ConfigMap to be present in the namespace
-    2. Patch the ConfigMap
-    3. Read back the ConfigMap
-    4. Repeat steps 2-3 if ConfigMap does not reflect the changes requested
-    """
-    k8sclient = ApiClient()
-    retries = max_attempts
-    retry = Retry(
-        total=retries, read=retries, connect=retries, backoff_factor=0.3,
-        status_forcelist=(500, 502, 503, 504)
-    )
-    k8sclient.rest_client.pool_manager.connection_pool_kw['retries'] = retry
-    api_instance = client.CoreV1Api(k8sclient)
-    attempt = 0
+def _read_config_map(api_instance, name, namespace):
+    """Read the ConfigMap, waiting for it to be created if it does not exist yet."""
+    try:
+        return api_instance.read_namespaced_config_map(name, namespace)
+    except ApiException as err:
+        LOGGER.exception("Error calling read_namespaced_config_map")
+        if err.status != ERR_NOT_FOUND:
+            raise  # unrecoverable
 
-    while True:
+        # ConfigMap doesn't exist yet
+        LOGGER.warning("ConfigMap %s/%s doesn't exist, waiting for it to be created.", namespace, name)
+        config_map = wait_for_config_map(api_instance, name, namespace)
+        if config_map is None:
+            raise
+        return config_map
 
-        # Wait a while to check the ConfigMap in case multiple products are
-        # attempting to update the same ConfigMap, or the ConfigMap doesn't
-        # exist yet
-        attempt += 1
-        sleepy_time = random.randint(1, 3)
-        LOGGER.info("Resting %ss before reading ConfigMap", sleepy_time)
-        time.sleep(sleepy_time)
 
-        # Read in the ConfigMap
-        try:
-            response = api_instance.read_namespaced_config_map(name, namespace)
-        except ApiException as err:
-            LOGGER.exception("Error calling read_namespaced_config_map")
+def _attempt_delete(api_instance, name, namespace, product, product_version, key=None):
+    """Read the ConfigMap and patch it to remove the product version or key.
 
-            # ConfigMap doesn't exist yet
-            if err.status == ERR_NOT_FOUND and attempt < max_attempts:
-                LOGGER.warning("ConfigMap %s/%s doesn't exist, attempting again.", namespace, name)
-                continue
-            raise  # unrecoverable
+    Returns:
+        bool: True if the ConfigMap was patched, False if there was nothing to remove.
 
-        # Determine if ConfigMap needs to be updated
-        config_map_data = response.data or {}  # if no ConfigMap data exists
-        if product not in config_map_data:
-            break  # product doesn't exist, don't need to remove anything
+    Raises:
+        ApiException: if reading or patching the ConfigMap failed.
+    """
+    response = _read_config_map(api_instance, name, namespace)
+
+    # Determine if ConfigMap needs to be updated
+    config_map_data = response.data or {}  # if no ConfigMap data exists
+    if product not in config_map_data:
+        return False  # product doesn't exist, don't need to remove anything
+
+    # Product exists in ConfigMap. Return before dumping and patching it
+    # whenever there is nothing to remove.
+    product_data = load_yaml(config_map_data[product]) or {}
+    if product_version not in product_data:
+        LOGGER.info(
+            "Version %s not in ConfigMap", product_version
+        )
+        return False  # product version is gone, we are done
 
-        # Product exists in ConfigMap
-        product_data = yaml.safe_load(config_map_data[product])
-        if product_version not in product_data:
+    # Product version exists in ConfigMap
+    if key:
+        # Key exists, remove it
+        if key in product_data[product_version]:
             LOGGER.info(
-                "Version %s not in ConfigMap", product_version
+                "key=%s in version=%s exists; to be removed",
+                key, product_version
             )
-            break  # product version is gone, we are done
-
-        # Product version exists in ConfigMap
-        if key:
-            # Key exists, remove it
-            if key in product_data[product_version]:
-                LOGGER.info(
-                    "key=%s in version=%s exists; to be removed",
-                    key, product_version
-                )
-                product_data[product_version].pop(key)
-            else:
-                # No keys left
-                if not product_data[product_version].keys():
-                    LOGGER.info(
-                        "No keys remain in version=%s; removing version",
-                        product_version
-                    )
-                    product_data.pop(product_version)
-                else:
-                    break  # key is gone, we are done
-        else:
+            product_data[product_version].pop(key)
+        elif product_data[product_version]:
+            return False  # key is gone, we are done
+
+        # No keys left
+        if not product_data[product_version]:
             LOGGER.info(
-                "Removing product=%s, version=%s",
-                product, product_version
+                "No keys remain in version=%s; removing version",
+                product_version
             )
             product_data.pop(product_version)
-
-        # Patch the ConfigMap
-        config_map_data[product] = yaml.safe_dump(
-            product_data, default_flow_style=False
+    else:
+        LOGGER.info(
+            "Removing product=%s, version=%s",
+            product, product_version
         )
-        LOGGER.info("ConfigMap update attempt=%s", attempt)
-        try:
-            api_instance.patch_namespaced_config_map(
-                name, namespace, client.V1ConfigMap(data=config_map_data)
-            )
-            LOGGER.info("ConfigMap update attempt %s successful", attempt)
-        except ApiException as exc:
-            if exc.status == ERR_CONFLICT:
-                # A conflict is raised if the resourceVersion field was unexpectedly
-                # incremented, e.g. if another process updated the ConfigMap. This
-                # provides concurrency protection.
-                LOGGER.warning("Conflict updating ConfigMap")
-            else:
-                LOGGER.exception("Error calling patch_namespaced_config_map")
+        product_data.pop(product_version)
+
+    # Patch the ConfigMap, only sending the data for this product; the patch
+    # is merged with the data for other products by the API server. If no
+    # versions of the product remain, a null value removes the product. The
+    # resourceVersion makes the patch fail with a conflict if the ConfigMap
+    # was changed since it was read.
+    body = {
+        'metadata': {'name': name, 'resourceVersion': response.metadata.resource_version},
+        'data': {product: dump_yaml(product_data) if product_data else None},
+    }
+    try:
+        api_instance.patch_namespaced_config_map(
+            name, namespace, body, field_manager=PRODUCT_CATALOG_FIELD_MANAGER
+        )
+    except ApiException as exc:
+        if exc.status == ERR_CONFLICT:
+            # A conflict is raised if the resourceVersion field was unexpectedly
+            # incremented, e.g. if another process updated the ConfigMap. This
+            # provides concurrency protection.
+            LOGGER.warning("Conflict updating ConfigMap")
+        else:
+            LOGGER.exception("Error calling patch_namespaced_config_map")
+        raise
+    LOGGER.info("ConfigMap update successful")
+    return True
+
+
+def modify_config_map(name, namespace, product, product_version, key=None, max_attempts=MAX_RETRIES):
+    """Remove a product version from the catalog ConfigMap.
+
+    If a key is specified, delete the `key` content from a specific section
+    of the catalog ConfigMap. If there are no more keys after it has been
+    removed, remove the version mapping as well.
+
+    1. Read the ConfigMap, waiting for it to be present in the namespace
+    2. Patch the ConfigMap if it contains the content to remove
+    3. Repeat steps 1-2 with exponential backoff only if step 2 failed
+       due to a conflict, up to `max_attempts` times.
+    """
+    api_instance = get_core_v1_api()
+
+    retry_on_conflict(
+        lambda: _attempt_delete(api_instance, name, namespace, product, product_version, key),
+        steps=max_attempts
+    )
 
 
 def main():
@@ -2,7 +2,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2020-2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2020-2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -31,60 +31,98 @@ a YAML file to a Kubernetes ConfigMap as follows:
   {PRODUCT_VERSION}:
     {content of yaml file}
 
-Since updates to a ConfigMap are not atomic, this script will continue to
-attempt to update the ConfigMap until it has been patched successfully.
+Since updates to a ConfigMap are not atomic, this script will retry the
+update if it conflicts with an update made by another process.
 """
 
 import logging
 import os
-import random
-import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
 
 import urllib3
-import yaml
-from jsonschema.exceptions import ValidationError
-from kubernetes.client.api_client import ApiClient
 from kubernetes.client.models.v1_config_map import V1ConfigMap
 from kubernetes.client.models.v1_object_meta import V1ObjectMeta
 from kubernetes.client.rest import ApiException
-from kubernetes import client
-from urllib3.util.retry import Retry
 
 from cray_product_catalog.logging import configure_logging
-from cray_product_catalog.schema.validate import validate
-from cray_product_catalog.util.k8s import load_k8s
+from cray_product_catalog.util.k8s import get_core_v1_api, load_k8s, retry_on_conflict, wait_for_config_map
+from cray_product_catalog.util.yaml_helper import dump_yaml, load_yaml
 from cray_product_catalog.util.merge_dict import merge_dict
 from cray_product_catalog.util.catalog_data_helper import split_catalog_data, format_product_cm_name
-from cray_product_catalog.constants import PRODUCT_CATALOG_CONFIG_MAP_LABEL
+from cray_product_catalog.constants import (
+    PRODUCT_CONFIG_MAP_LABEL,
+    PRODUCT_CATALOG_CONFIG_MAP_NAME,
+    PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
+    PRODUCT_CATALOG_FIELD_MANAGER,
+)
 
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-# Parameters to identify ConfigMap and content in it to update
-PRODUCT = os.environ.get("PRODUCT").strip()  # required
-PRODUCT_VERSION = os.environ.get("PRODUCT_VERSION").strip()  # required
-MAIN_CONFIG_MAP = os.environ.get("CONFIG_MAP", "cray-product-catalog").strip()
-CONFIG_MAP_NAMESPACE = os.environ.get("CONFIG_MAP_NAMESPACE", "services").strip()
-# One of (YAML_CONTENT_FILE, YAML_CONTENT_STRING) required. For backwards compatibility, YAML_CONTENT
-# may also be given in place of YAML_CONTENT_FILE.
-YAML_CONTENT_FILE = (os.environ.get("YAML_CONTENT_FILE") or os.environ.get("YAML_CONTENT", "")).strip()
-YAML_CONTENT_STRING = os.environ.get("YAML_CONTENT_STRING", "").strip()   # see above
-SET_ACTIVE_VERSION = bool(os.environ.get("SET_ACTIVE_VERSION"))
-REMOVE_ACTIVE_FIELD = bool(os.environ.get("REMOVE_ACTIVE_FIELD"))
-VALIDATE_SCHEMA = bool(os.environ.get("VALIDATE_SCHEMA"))
-UPDATE_OVERWRITE = bool(os.environ.get("UPDATE_OVERWRITE"))
-
 ERR_NOT_FOUND = 404
 ERR_CONFLICT = 409
 
+# retries
+MAX_RETRIES = 100
+
 LOGGER = logging.getLogger(__name__)
 
 
+class UpdateConfig(NamedTuple):
+    """Parameters to identify the ConfigMap and the content in it to update."""
+    product: str
+    product_version: str
+    main_config_map: str = PRODUCT_CATALOG_CONFIG_MAP_NAME
+    config_map_namespace: str = PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE
+    yaml_content_file: str = ''
+    yaml_content_string: str = ''
+    set_active_version: bool = False
+    remove_active_field: bool = False
+    validate_schema: bool = False
+    update_overwrite: bool = False
+
+    @classmethod
+    def from_env(cls):
+        """Build the configuration from environment variables.
+
+        Returns:
+            UpdateConfig: The configuration.
+
+        Raises:
+            SystemExit: if PRODUCT or PRODUCT_VERSION is not set.
+        """
+        product = os.environ.get("PRODUCT", "").strip()  # required
+        product_version = os.environ.get("PRODUCT_VERSION", "").strip()  # required
+        if not product or not product_version:
+            LOGGER.error("The environment variables PRODUCT and PRODUCT_VERSION must be specified")
+            raise SystemExit(1)
+        return cls(
+            product=product,
+            product_version=product_version,
+            main_config_map=os.environ.get("CONFIG_MAP", PRODUCT_CATALOG_CONFIG_MAP_NAME).strip(),
+            config_map_namespace=os.environ.get("CONFIG_MAP_NAMESPACE", PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE).strip(),
+            # One of (YAML_CONTENT_FILE, YAML_CONTENT_STRING) required. For backwards compatibility,
+            # YAML_CONTENT may also be given in place of YAML_CONTENT_FILE.
+            yaml_content_file=(os.environ.get("YAML_CONTENT_FILE") or os.environ.get("YAML_CONTENT", "")).strip(),
+            yaml_content_string=os.environ.get("YAML_CONTENT_STRING", "").strip(),  # see above
+            set_active_version=bool(os.environ.get("SET_ACTIVE_VERSION")),
+            remove_active_field=bool(os.environ.get("REMOVE_ACTIVE_FIELD")),
+            validate_schema=bool(os.environ.get("VALIDATE_SCHEMA")),
+            update_overwrite=bool(os.environ.get("UPDATE_OVERWRITE")),
+        )
+
+
 def validate_schema(data):
     """ Validate data against the schema. """
     LOGGER.debug(
         "Validating data against schema because VALIDATE_SCHEMA was set"
     )
+    # jsonschema is slow to import and only needed if VALIDATE_SCHEMA is set
+    # pylint: disable=import-outside-toplevel
+    from jsonschema.exceptions import ValidationError
+    from cray_product_catalog.schema.validate import validate
+
     try:
         validate(data)
     except ValidationError as err:
@@ -96,241 +134,315 @@ def read_yaml_content(yaml_file):
     """ Read and return the raw content contained in the `yaml_file`. """
     LOGGER.debug("Retrieving content from %s", yaml_file)
     with open(yaml_file) as yfile:
-        return yaml.safe_load(yfile)
+        return load_yaml(yfile)
 
 
 def read_yaml_content_string(yaml_string):
     """ Read and return the raw content contained in the `yaml_string` string. """
     LOGGER.debug("Retrieving raw content specified as a string")
-    return yaml.safe_load(yaml_string)
+    return load_yaml(yaml_string)
 
 
-def set_active_version(product_data):
-    """ Modify product_data in place to set the 'active' key for PRODUCT_VERSION.
+def set_active_version(product_data, product_version):
+    """ Modify product_data in place to set the 'active' key for product_version.
 
     This also sets the 'active' key for other versions in product_data to False."""
     # Set the current version to 'active'
     for version in product_data:
-        product_data[version]['active'] = version == PRODUCT_VERSION
+        product_data[version]['active'] = version == product_version
 
 
-def current_version_is_active(product_data):
-    """ Return True if PRODUCT_VERSION is active and no other version of the product is active."""
-    current_version = product_data[PRODUCT_VERSION]
-    other_versions = [version for version in product_data if version != PRODUCT_VERSION]
+def get_active_state(product_data, product_version):
+    """ Return the state of the 'active' field of the versions of a product in a single pass.
 
-    return current_version.get('active') and not any(
-               product_data[version].get('active') for version in other_versions
-           )
+    Returns:
+        tuple: (current_version_is_active, active_field_exists) where
+            current_version_is_active is True if product_version is active and
+            no other version of the product is active, and active_field_exists
+            is True if any version of the product is using the 'active' field.
+    """
+    current_active = False
+    other_active = False
+    field_exists = False
+    for version, version_data in product_data.items():
+        if 'active' not in version_data:
+            continue
+        field_exists = True
+        if version == product_version:
+            current_active = bool(version_data['active'])
+        elif version_data['active']:
+            other_active = True
+    return current_active and not other_active, field_exists
 
 
-def remove_active_field(product_data):
+def remove_active_field(product_data, product):
     """ Remove the 'active' field for a given product. """
-    LOGGER.info("Deleting 'active' field for all versions of %s", PRODUCT)
+    LOGGER.info("Deleting 'active' field for all versions of %s", product)
     for version in product_data:
         if "active" in product_data[version]:
             del product_data[version]["active"]
 
 
-def active_field_exists(product_data):
-    """ Return True if any version of the given product is using the 'active' field."""
-    return any("active" in product_data[version] for version in product_data)
-
-
 def create_config_map(api_instance, name, namespace):
-    """Create new product ConfigMap. Raise an Exception on failure."""
+    """Create new product ConfigMap and return it. Raise an Exception on failure."""
     new_cm = V1ConfigMap()
-    new_cm.metadata = V1ObjectMeta(name=name, labels=PRODUCT_CATALOG_CONFIG_MAP_LABEL)
+    new_cm.metadata = V1ObjectMeta(name=name, labels=PRODUCT_CONFIG_MAP_LABEL)
     try:
-        api_instance.create_namespaced_config_map(namespace=namespace, body=new_cm)
+        config_map = api_instance.create_namespaced_config_map(namespace=namespace, body=new_cm)
     except ApiException:
         LOGGER.error("Error calling create_namespaced_config_map on ConfigMap %s/%s", namespace, name)
         raise
     LOGGER.info("Created product ConfigMap %s/%s", namespace, name)
+    return config_map
 
 
-def update_config_map(data: dict, name, namespace):
-    """
-    Get the ConfigMap `data` to be added.
+def read_config_map(api_instance, name, namespace, create=False):
+    """Read the ConfigMap and return it.
 
-    1. Wait for the ConfigMap to be present in the namespace
-    2. Read the ConfigMap
-    3. Patch the ConfigMap
-    4. Read back the ConfigMap
-    5. Repeat steps 2-4 if ConfigMap does not include the changes requested,
-       or if step 3 failed due to a conflict.
+    If the ConfigMap does not exist, create it if `create` is set (for a product
+    ConfigMap) or otherwise wait for it to be created (for the main ConfigMap).
+    Raise an Exception on failure.
     """
-    k8sclient = ApiClient()
-    retries = 100
-    retry = Retry(
-        total=retries, read=retries, connect=retries, backoff_factor=0.3,
-        status_forcelist=(500, 502, 503, 504)
-    )
-    k8sclient.rest_client.pool_manager.connection_pool_kw['retries'] = retry
-    api_instance = client.CoreV1Api(k8sclient)
-    attempt = 0
-
-    while attempt < retries:
-
-        # Wait a while to check the ConfigMap in case multiple products are
-        # attempting to update the same ConfigMap, or the ConfigMap doesn't
-        # exist yet
-        attempt += 1
-        sleepy_time = random.randint(1, 3)
-        LOGGER.debug("Resting %ss before reading ConfigMap", sleepy_time)
-        time.sleep(sleepy_time)
-
-        # Read in the ConfigMap
-        try:
-            response = api_instance.read_namespaced_config_map(name, namespace)
-        except ApiException as err:
-            LOGGER.info("Unable to read ConfigMap %s/%s", namespace, name)
-
-            if err.status != ERR_NOT_FOUND:
-                LOGGER.error("Unexpected error in read_namespaced_config_map "
-                             "on ConfigMap %s/%s", namespace, name)
-                raise   # unrecoverable
-
-            # ConfigMap doesn't exist yet
-            if name == MAIN_CONFIG_MAP:
-                # If main ConfigMap is not found wait until it is available
-                LOGGER.warning("ConfigMap %s/%s doesn't exist, attempting again", namespace, name)
-            else:
-                # If product ConfigMap is not available then create
-                LOGGER.info("Product ConfigMap %s/%s doesn't exist, attempting to create", namespace, name)
-                # The following call raises an exception on failure
-                create_config_map(api_instance, name, namespace)
-            continue
+    try:
+        return api_instance.read_namespaced_config_map(name, namespace)
+    except ApiException as err:
+        LOGGER.info("Unable to read ConfigMap %s/%s", namespace, name)
+
+        if err.status != ERR_NOT_FOUND:
+            LOGGER.error("Unexpected error in read_namespaced_config_map "
+                         "on ConfigMap %s/%s", namespace, name)
+            raise   # unrecoverable
+
+    # ConfigMap doesn't exist yet
+    if create:
+        # If product ConfigMap is not available then create
+        LOGGER.info("Product ConfigMap %s/%s doesn't exist, attempting to create", namespace, name)
+        # The following call raises an exception on failure
+        return create_config_map(api_instance, name, namespace)
+
+    # If main ConfigMap is not found wait until it is available
+    LOGGER.warning("ConfigMap %s/%s doesn't exist, waiting for it to be created", namespace, name)
+    config_map = wait_for_config_map(api_instance, name, namespace)
+    if config_map is None:
+        LOGGER.error("ConfigMap %s/%s was not created; Not updating ConfigMap.", namespace, name)
+        raise SystemExit(1)
+    return config_map
+
+
+def _get_updated_product_yaml(config, data, product_yaml, name, namespace):
+    """Return the product YAML from a ConfigMap updated with `data`.
 
-        # Determine if ConfigMap needs to be updated
-        config_map_data = response.data or {}  # if no ConfigMap data exists
-        if PRODUCT not in config_map_data:
-            LOGGER.info("Product=%s does not exist; will update", PRODUCT)
-            config_map_data[PRODUCT] = product_data = {PRODUCT_VERSION: {}}
-        # Product exists in ConfigMap
+    Args:
+        config (UpdateConfig): The configuration.
+        data (dict): The data to add to the product version.
+        product_yaml (str or None): The product YAML from the ConfigMap, or
+            None if the product does not exist in the ConfigMap.
+        name (str): The name of the ConfigMap.
+        namespace (str): The namespace of the ConfigMap.
+
+    Returns:
+        str or None: The updated product YAML, or None if no update is needed.
+    """
+    product = config.product
+    product_version = config.product_version
+
+    # Determine if ConfigMap needs to be updated
+    if product_yaml is None:
+        LOGGER.info("Product=%s does not exist; will update", product)
+        product_data = {product_version: merge_dict(data, {})}
+    # Product exists in ConfigMap
+    else:
+        product_data = load_yaml(product_yaml)
+        if product_version not in product_data:
+            LOGGER.info(
+                "Version=%s does not exist; will update", product_version
+            )
+            product_data[product_version] = merge_dict(data, {})
+        # Key with same version exists in ConfigMap
         else:
-            product_data = yaml.safe_load(config_map_data[PRODUCT])
-            if PRODUCT_VERSION not in product_data:
-                LOGGER.info(
-                    "Version=%s does not exist; will update", PRODUCT_VERSION
-                )
-                product_data[PRODUCT_VERSION] = {}
-            # Key with same version exists in ConfigMap
+            if config.update_overwrite:
+                # Copy it, since setting or removing the active field below must not modify `data`,
+                # which is used again on retries and for the other ConfigMap
+                product_data[product_version] = dict(data)
+                update_exists = True
             else:
+                # Merge once and keep the result for the patch below
+                merged_version_data = merge_dict(data, product_data[product_version])
                 # Data to insert matches data found in ConfigMap.
-                merged_product_data = None
-                if UPDATE_OVERWRITE:
-                    product_data[PRODUCT_VERSION] = data
+                update_exists = merged_version_data == product_data[product_version]
+                product_data[product_version] = merged_version_data
+
+            if update_exists:
+                if config.set_active_version and config.remove_active_field:
+                    # This should not happen (see main method).
+                    raise SystemExit(1)
+                current_version_is_active, active_field_exists = get_active_state(product_data, product_version)
+                if config.set_active_version:
+                    if current_version_is_active:
+                        LOGGER.debug("ConfigMap %s/%s data updates exist and desired version is active; Exiting",
+                                     namespace, name)
+                        return None
+                elif config.remove_active_field:
+                    if not active_field_exists:
+                        LOGGER.debug("ConfigMap %s/%s data updates exist and 'active' field has been cleared; "
+                                     "Exiting", namespace, name)
+                        return None
                 else:
-                    merged_product_data = merge_dict(
-                        data, product_data[PRODUCT_VERSION]) == product_data[PRODUCT_VERSION]
-
-                if merged_product_data or UPDATE_OVERWRITE:
-                    if SET_ACTIVE_VERSION and REMOVE_ACTIVE_FIELD:
-                        # This should not happen (see main method).
-                        raise SystemExit(1)
-                    if SET_ACTIVE_VERSION:
-                        if current_version_is_active(product_data):
-                            LOGGER.debug("ConfigMap %s/%s data updates exist and desired version is active; Exiting",
-                                         namespace, name)
-                            break
-                    elif REMOVE_ACTIVE_FIELD:
-                        if not active_field_exists(product_data):
-                            LOGGER.debug("ConfigMap %s/%s data updates exist and 'active' field has been cleared; "
-                                         "Exiting", namespace, name)
-                            break
-                    else:
-                        LOGGER.debug("ConfigMap %s/%s data updates exist; Exiting", namespace,
-                                     name)
-                        break
-
-        # Patch the ConfigMap if needed
-        product_data[PRODUCT_VERSION] = merge_dict(data, product_data[PRODUCT_VERSION])
-        if SET_ACTIVE_VERSION:
-            set_active_version(product_data)
-        if REMOVE_ACTIVE_FIELD:
-            remove_active_field(product_data)
-        config_map_data[PRODUCT] = yaml.safe_dump(
-            product_data, default_flow_style=False
+                    LOGGER.debug("ConfigMap %s/%s data updates exist; Exiting", namespace,
+                                 name)
+                    return None
+
+    # Update the product data if needed
+    if config.set_active_version:
+        set_active_version(product_data, product_version)
+    if config.remove_active_field:
+        remove_active_field(product_data, product)
+    return dump_yaml(product_data)
+
+
+def _attempt_update(api_instance, config, data, name, namespace, product_yaml_cache):
+    """Read the ConfigMap and patch it with `data` if it does not already include it.
+
+    The updated product YAML is cached in `product_yaml_cache` by the product
+    YAML read from the ConfigMap, so that it is not loaded, merged and dumped
+    again if a retry reads the same product YAML, e.g. because the conflict
+    was caused by an update to a different product.
+
+    Returns:
+        bool: True if the ConfigMap was patched, False if no update was needed.
+
+    Raises:
+        ApiException: if reading or patching the ConfigMap failed.
+    """
+    response = read_config_map(api_instance, name, namespace, create=name != config.main_config_map)
+
+    config_map_data = response.data or {}  # if no ConfigMap data exists
+    product_yaml = config_map_data.get(config.product)
+    if product_yaml not in product_yaml_cache:
+        product_yaml_cache[product_yaml] = _get_updated_product_yaml(config, data, product_yaml, name, namespace)
+    updated_product_yaml = product_yaml_cache[product_yaml]
+    if updated_product_yaml is None:
+        return False
+
+    # Only send the data for this product; the patch is merged with the
+    # data for other products by the API server
+    body = {
+        'metadata': {'name': name, 'resourceVersion': response.metadata.resource_version},
+        'data': {config.product: updated_product_yaml},
+    }
+    try:
+        api_instance.patch_namespaced_config_map(
+            name, namespace, body=body, field_manager=PRODUCT_CATALOG_FIELD_MANAGER
         )
-        LOGGER.debug("ConfigMap %s/%s update attempt=%s", namespace, name, attempt)
-        try:
-            new_config_map = V1ConfigMap(data=config_map_data)
-            new_config_map.metadata = V1ObjectMeta(
-                name=name, resource_version=response.metadata.resource_version
-            )
-            api_instance.patch_namespaced_config_map(
-                name, namespace, body=new_config_map
-            )
-        except ApiException as err:
-            if err.status == ERR_CONFLICT:
-                # A conflict is raised if the resourceVersion field was
-                # unexpectedly incremented, e.g. if another process updated the
-                # ConfigMap. This provides concurrency protection.
-                LOGGER.warning("Conflict updating ConfigMap %s/%s", namespace,
-                               name)
-            else:
-                LOGGER.warning("Failure calling replace_namespaced_config_map on ConfigMap %s/%s",
-                               namespace, name)
+    except ApiException as err:
+        if err.status == ERR_CONFLICT:
+            # A conflict is raised if the resourceVersion field was
+            # unexpectedly incremented, e.g. if another process updated the
+            # ConfigMap. This provides concurrency protection.
+            LOGGER.warning("Conflict updating ConfigMap %s/%s", namespace,
+                           name)
+        else:
+            LOGGER.error("Failure calling patch_namespaced_config_map on ConfigMap %s/%s",
+                         namespace, name)
+        raise
+    LOGGER.debug("ConfigMap %s/%s updated", namespace, name)
+    return True
 
-    if attempt == retries:
-        LOGGER.error("Exceeded number of attempts; Not updating ConfigMap %s/%s.", namespace, name)
-        raise SystemExit(1)
+
+def update_config_map(config, data: dict, name, namespace):
+    """
+    Get the ConfigMap `data` to be added.
+
+    1. Read the ConfigMap, waiting for it to be present in the namespace
+    2. Patch the ConfigMap if it does not include the changes requested
+    3. Repeat steps 1-2 with exponential backoff only if step 2 failed
+       due to a conflict, up to MAX_RETRIES times.
+
+    A product ConfigMap is not read or patched if there is no `data` to add.
+    The main ConfigMap is always updated since it records the version and
+    whether it is active even if there is no `data` for it.
+    """
+    if not data and name != config.main_config_map:
+        LOGGER.debug("No data to update in ConfigMap %s/%s; Skipping", namespace, name)
+        return
+
+    api_instance = get_core_v1_api()
+
+    try:
+        product_yaml_cache = {}
+        retry_on_conflict(
+            lambda: _attempt_update(api_instance, config, data, name, namespace, product_yaml_cache),
+            steps=MAX_RETRIES
+        )
+    except ApiException as err:
+        if err.status == ERR_CONFLICT:
+            LOGGER.error("Exceeded number of attempts; Not updating ConfigMap %s/%s.", namespace, name)
+        raise SystemExit(1) from err
 
 
 def main():
     """ Main function """
     configure_logging()
+    config = UpdateConfig.from_env()
     LOGGER.info(
         "Updating ConfigMap=%s in namespace=%s for product/version=%s/%s",
-        MAIN_CONFIG_MAP, CONFIG_MAP_NAMESPACE, PRODUCT, PRODUCT_VERSION
+        config.main_config_map, config.config_map_namespace, config.product, config.product_version
     )
 
-    if SET_ACTIVE_VERSION and REMOVE_ACTIVE_FIELD:
+    if config.set_active_version and config.remove_active_field:
         LOGGER.error(
             "SET_ACTIVE_VERSION and REMOVE_ACTIVE_FIELD cannot both be set"
         )
         raise SystemExit(1)
 
-    if SET_ACTIVE_VERSION:
+    if config.set_active_version:
         LOGGER.info(
             "Setting %s:%s to active because SET_ACTIVE_VERSION was set",
-            PRODUCT, PRODUCT_VERSION
+            config.product, config.product_version
         )
 
-    elif REMOVE_ACTIVE_FIELD:
+    elif config.remove_active_field:
         LOGGER.info(
-            "Product %s will have 'active' value cleared because REMOVE_ACTIVE_FIELD was set", PRODUCT
+            "Product %s will have 'active' value cleared because REMOVE_ACTIVE_FIELD was set", config.product
         )
 
     load_k8s()
-    if YAML_CONTENT_FILE:
-        data = read_yaml_content(YAML_CONTENT_FILE)
-    elif YAML_CONTENT_STRING:
-        data = read_yaml_content_string(YAML_CONTENT_STRING)
+    if config.yaml_content_file:
+        data = read_yaml_content(config.yaml_content_file)
+    elif config.yaml_content_string:
+        data = read_yaml_content_string(config.yaml_content_string)
     else:
         LOGGER.error(
             "One of the environment variables YAML_CONTENT_FILE or "
             "YAML_CONTENT_STRING must be specified"
         )
         raise SystemExit(1)
-    if VALIDATE_SCHEMA:
+    if config.validate_schema:
         validate_schema(data)
 
-    product_config_map = format_product_cm_name(MAIN_CONFIG_MAP, PRODUCT)
+    product_config_map = format_product_cm_name(config.main_config_map, config.product)
 
     LOGGER.debug("Splitting cray-product-catalog data")
     main_cm_data, prod_cm_data = split_catalog_data(data)
 
     if prod_cm_data and product_config_map == '':
-        LOGGER.error("Not updating ConfigMaps because the provided product name is invalid: '%s'", PRODUCT)
+        LOGGER.error("Not updating ConfigMaps because the provided product name is invalid: '%s'", config.product)
         raise SystemExit(1)
 
-    update_config_map(main_cm_data, MAIN_CONFIG_MAP, CONFIG_MAP_NAMESPACE)
+    # The main and product ConfigMaps are independent, so update them concurrently
+    namespace = config.config_map_namespace
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(update_config_map, config, main_cm_data, config.main_config_map, namespace)]
+
+        # If product_config_map is not an empty string and prod_cm_data is not an empty dict
+        if prod_cm_data:
+            futures.append(
+                executor.submit(update_config_map, config, prod_cm_data, product_config_map, namespace)
+            )
 
-    # If product_config_map is not an empty string and prod_cm_data is not an empty dict
-    if prod_cm_data:
-        update_config_map(prod_cm_data, product_config_map, CONFIG_MAP_NAMESPACE)
+        # Re-raise any exception, including SystemExit, from the updates
+        for future in futures:
+            future.result()
 
 
 if __name__ == "__main__":
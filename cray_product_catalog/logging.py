@@ -1,6 +1,6 @@
 # MIT License
 #
-# (C) Copyright 2022-2023 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2022-2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -32,10 +32,15 @@ import sys
 def configure_logging():
     """
     Configure the cray_product_catalog logger.
+
+    Does nothing if the logger already has a handler, so that calling this
+    more than once does not log every message more than once.
     """
     # Get the package name (e.g. cray_product_catalog)
     logger_name = __name__.split('.', 1)[0]
     logger = logging.getLogger(logger_name)
+    if logger.handlers:
+        return
     logger.setLevel(logging.INFO)
     handler = logging.StreamHandler(sys.stdout)
     handler.setLevel(logging.DEBUG)
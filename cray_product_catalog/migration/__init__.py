@@ -1,6 +1,6 @@
 # MIT License
 #
-# (C) Copyright 2023-2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2023-2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -37,8 +37,16 @@ PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE = os.environ.get("CONFIG_MAP_NAMESPACE", "s
 # ConfigMap names
 CRAY_DATA_CATALOG_LABEL = PRODUCT_CATALOG_CONFIG_MAP_LABEL_STR
 
-# product ConfigMap pattern
-PRODUCT_CONFIG_MAP_PATTERN = re.compile('^(cray-product-catalog)-([a-z0-9.-]+)$')
+# product ConfigMap pattern, built from the main ConfigMap name; use fullmatch to match it
+PRODUCT_CONFIG_MAP_PATTERN = re.compile(f'({re.escape(PRODUCT_CATALOG_CONFIG_MAP_NAME)})-([a-z0-9.-]+)')
 RESOURCE_VERSION = 'resource_version'
 
 RETRY_COUNT = 10
+
+# Maximum number of concurrent Kubernetes API requests when creating or deleting product ConfigMaps
+MAX_WORKERS = 8
+
+# Maximum number of connections to the Kubernetes API to keep in the pool, so that
+# each concurrent request reuses a connection rather than opening and discarding one; the
+# temporary main ConfigMap is created alongside the MAX_WORKERS product ConfigMap requests
+CONNECTION_POOL_MAXSIZE = MAX_WORKERS + 1
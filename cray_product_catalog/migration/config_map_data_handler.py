@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2023-2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2023-2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -30,48 +30,203 @@ Rename ConfigMap
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-import yaml
+from yaml import MappingNode, ScalarNode
 
 from cray_product_catalog.util.catalog_data_helper import split_catalog_data, format_product_cm_name
+from cray_product_catalog.util.yaml_helper import compose_yaml, dump_yaml, load_yaml, serialize_yaml
 from cray_product_catalog.migration.kube_apis import KubernetesApi
-from cray_product_catalog.constants import PRODUCT_CATALOG_CONFIG_MAP_LABEL
+from cray_product_catalog.constants import PRODUCT_CATALOG_CONFIG_MAP_LABEL, PRODUCT_CM_FIELDS, PRODUCT_CONFIG_MAP_LABEL
 from cray_product_catalog.migration import (
-    CONFIG_MAP_TEMP, PRODUCT_CATALOG_CONFIG_MAP_NAME, PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE
+    CONFIG_MAP_TEMP, MAX_WORKERS, PRODUCT_CATALOG_CONFIG_MAP_NAME, PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE
 )
 
 LOGGER = logging.getLogger(__name__)
 
 
+_MAP_TAG = 'tag:yaml.org,2002:map'
+_MERGE_TAG = 'tag:yaml.org,2002:merge'
+
+
+def _is_plain_mapping(node):
+    """Returns True if node is a mapping node whose keys are all scalars and which has no merge keys."""
+    return isinstance(node, MappingNode) and all(
+        isinstance(key, ScalarNode) and key.tag != _MERGE_TAG for key, _ in node.value
+    )
+
+
+def _split_product_nodes(product, root):
+    """Split the composed data for each version of a product into nodes for the main and product ConfigMaps.
+
+    Args:
+        product (str): The name of the product.
+        root (yaml.MappingNode): The composed YAML data for all versions of the product.
+
+    Returns:
+        (yaml.MappingNode, yaml.MappingNode): The nodes for the main ConfigMap and
+            for the product ConfigMap.
+    """
+    main_versions = []
+    product_versions = []
+    for version_key, version_values in root.value:
+        LOGGER.debug("Splitting cray-product-catalog data for product %s", product)
+        main_fields = []
+        product_fields = []
+        for field_key, field_value in version_values.value:
+            if field_key.value in PRODUCT_CM_FIELDS:
+                product_fields.append((field_key, field_value))
+            else:
+                main_fields.append((field_key, field_value))
+        if not product_fields:
+            # nothing to split out, so the version's node is reused as it is
+            main_versions.append((version_key, version_values))
+            continue
+        # an empty mapping is kept for a version with no main ConfigMap data
+        main_versions.append((version_key, MappingNode(_MAP_TAG, main_fields, flow_style=False)))
+        product_versions.append((version_key, MappingNode(_MAP_TAG, product_fields, flow_style=False)))
+    return MappingNode(_MAP_TAG, main_versions, flow_style=False), \
+        MappingNode(_MAP_TAG, product_versions, flow_style=False)
+
+
+def _split_loaded_product_yaml(product, product_yaml):
+    """Split the data for each version of a product by loading it into Python objects.
+
+    Args:
+        product (str): The name of the product.
+        product_yaml (str): The YAML data for all versions of the product.
+
+    Returns:
+        (str, str): The YAML data for the main ConfigMap, and the YAML data
+            for the product ConfigMap or None if there is no product ConfigMap data.
+    """
+    product_data = load_yaml(product_yaml)
+    product_versions_data = {}
+    main_versions_data = {}
+    for version_data, version_values in product_data.items():
+        LOGGER.debug("Splitting cray-product-catalog data for product %s", product)
+        main_cm_data, prod_cm_data = split_catalog_data(version_values)
+        # prod_cm_data is not an empty dictionary
+        if prod_cm_data:
+            product_versions_data[version_data] = prod_cm_data
+        # main_cm_data is an empty dictionary if the version has no other data, which is kept as an entry
+        main_versions_data[version_data] = main_cm_data
+    if product_versions_data:
+        return dump_yaml(main_versions_data), dump_yaml(product_versions_data)
+    return dump_yaml(main_versions_data), None
+
+
+@lru_cache(maxsize=1024)
+def _split_product_yaml(product, product_yaml):
+    """Split the data for each version of a product into data for the main and product ConfigMaps.
+
+    The YAML is composed into a representation graph which is split and
+    serialized again, without constructing Python objects for the data.
+    Data that is not a mapping of versions to mappings of fields, or that
+    uses merge keys, is loaded and dumped instead. Data with nothing to
+    split out is returned unchanged.
+
+    The result is cached by the product YAML, so that the same data is not
+    split again when the migration is retried.
+
+    Args:
+        product (str): The name of the product.
+        product_yaml (str): The YAML data for all versions of the product.
+
+    Returns:
+        (str, str): The YAML data for the main ConfigMap, and the YAML data
+            for the product ConfigMap or None if there is no product ConfigMap data.
+    """
+    root = compose_yaml(product_yaml)
+    if not (_is_plain_mapping(root) and all(_is_plain_mapping(version_values) for _, version_values in root.value)):
+        return _split_loaded_product_yaml(product, product_yaml)
+
+    main_node, product_node = _split_product_nodes(product, root)
+    if not product_node.value:
+        # the main ConfigMap data would be unchanged, so it is not serialized again
+        return product_yaml, None
+    return serialize_yaml(main_node), serialize_yaml(product_node)
+
+
 class ConfigMapDataHandler:
     """ Class to migrate ConfigMap data to multiple ConfigMaps """
 
     def __init__(self) -> None:
         self.k8s_obj = KubernetesApi()
 
-    def create_product_config_maps(self, product_config_map_data_list):
-        """Create new product ConfigMap for each product in product_config_map_data_list
+    def create_product_config_maps(self, product_config_map_data):
+        """Create new product ConfigMap for each product in product_config_map_data
+
+        The product ConfigMaps are created concurrently, up to MAX_WORKERS at a time.
 
         Args:
-            product_config_map_data_list (list): list of data to be stored in each product ConfigMap
+            product_config_map_data (dict): the YAML data to be stored in each product's ConfigMap,
+                keyed by product name
+
+        Returns:
+            bool: True if all product ConfigMaps were created, False otherwise
         """
-        for product_data in product_config_map_data_list:
-            product_name = list(product_data.keys())[0]
-            LOGGER.debug("Creating ConfigMap for product %s", product_name)
+        product_config_maps = []
+        for product_name, product_yaml in product_config_map_data.items():
             prod_cm_name = format_product_cm_name(PRODUCT_CATALOG_CONFIG_MAP_NAME, product_name)
             if prod_cm_name == '':
                 LOGGER.error("Failed to create ConfigMap %s/%s because the provided product name is invalid: '%s'",
                              PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE, prod_cm_name, product_name)
                 return False
+            product_config_maps.append((prod_cm_name, {product_name: product_yaml}))
 
-            if not self.k8s_obj.create_config_map(prod_cm_name, PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE, product_data,
-                                                  PRODUCT_CATALOG_CONFIG_MAP_LABEL):
-                LOGGER.info("Failed to create product ConfigMap %s/%s", PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-                            prod_cm_name)
-                return False
-            LOGGER.info("Created product ConfigMap %s/%s", PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE, prod_cm_name)
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            results = list(executor.map(lambda args: self._create_product_config_map(*args), product_config_maps))
+        return all(results)
+
+    def _create_product_config_map(self, prod_cm_name, product_data):
+        """Create a product ConfigMap
+
+        Args:
+            prod_cm_name (str): name of the product ConfigMap
+            product_data (dict): data to be stored in the product ConfigMap
+
+        Returns:
+            bool: True if the product ConfigMap was created, False otherwise
+        """
+        LOGGER.debug("Creating ConfigMap %s", prod_cm_name)
+        if not self.k8s_obj.create_config_map(prod_cm_name, PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE, product_data,
+                                              PRODUCT_CONFIG_MAP_LABEL):
+            LOGGER.info("Failed to create product ConfigMap %s/%s", PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
+                        prod_cm_name)
+            return False
+        LOGGER.info("Created product ConfigMap %s/%s", PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE, prod_cm_name)
         return True
 
+    def delete_product_config_maps(self, products):
+        """Delete the product ConfigMap for each product in products
+
+        The product ConfigMaps are deleted concurrently, up to MAX_WORKERS at a time.
+
+        Args:
+            products (iterable): names of the products whose ConfigMaps are deleted
+
+        Returns:
+            bool: True if all product ConfigMaps were deleted, False otherwise
+        """
+        prod_cm_names = []
+        for product in products:
+            prod_cm_name = format_product_cm_name(PRODUCT_CATALOG_CONFIG_MAP_NAME, product)
+            if prod_cm_name == '':
+                # no ConfigMap can have been created for it, so there is nothing to delete
+                LOGGER.warning("Not deleting ConfigMap for product '%s' because the product name is invalid",
+                               product)
+                continue
+            prod_cm_names.append(prod_cm_name)
+
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            results = list(executor.map(
+                lambda prod_cm_name: self.k8s_obj.delete_config_map(prod_cm_name, PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE),
+                prod_cm_names
+            ))
+        return all(results)
+
     def create_temp_config_map(self, config_map_data):
         """Create temporary main ConfigMap `cray-product-catalog-temp`
 
@@ -92,93 +247,57 @@ class ConfigMapDataHandler:
         `component_versions` data for each product
 
         Returns:
-            {Dictionary, List}: Main ConfigMap Data, list of product ConfigMap data
+            {Dictionary, Dictionary}: Main ConfigMap Data, product ConfigMap YAML data keyed by product name
         """
 
         LOGGER.info(
             "Migrating data in ConfigMap=%s in namespace=%s to multiple ConfigMaps",
             PRODUCT_CATALOG_CONFIG_MAP_NAME, PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE
         )
-        # Get list of products
-        products_list = list(config_map_data.keys())
-        product_config_map_data_list = []
-        for product in products_list:
-            product_data = yaml.safe_load(config_map_data[product])
-            # Get list of versions associated with product
-            product_versions_list = list(product_data.keys())
-            product_versions_data = {}
-            main_versions_data = {}
-            for version_data in product_versions_list:
-                LOGGER.debug("Splitting cray-product-catalog data for product %s", product)
-                main_cm_data, prod_cm_data = split_catalog_data(product_data[version_data])
-                # prod_cm_data is not an empty dictionary
-                if prod_cm_data:
-                    product_config_map_data = {}
-                    product_versions_data[version_data] = prod_cm_data
-                # main_cm_data is not an empty dictionary
-                if main_cm_data:
-                    main_versions_data[version_data] = main_cm_data
-                # create an empty dictionary entry for the version
-                else:
-                    main_versions_data[version_data] = {}
+        product_config_map_data = {}
+        # Only existing keys are replaced, so config_map_data can be updated while iterating over it
+        for product, product_yaml in config_map_data.items():
+            # Data which does not mention any product ConfigMap field cannot contain one, so it is
+            # left in the main ConfigMap as it is without being parsed
+            if not any(field in product_yaml for field in PRODUCT_CM_FIELDS):
+                continue
+            main_versions_yaml, product_versions_yaml = _split_product_yaml(product, product_yaml)
             # If `component_versions` data exists for a product, create new product ConfigMap
-            if product_versions_data:
-                product_config_map_data = {
-                    product: yaml.safe_dump(product_versions_data, default_flow_style=False)
-                }
-                product_config_map_data_list.append(product_config_map_data)
+            if product_versions_yaml is not None:
+                product_config_map_data[product] = product_versions_yaml
             # Data with key other than `component_versions` should be updated to config_map_data,
             # so that new main ConfigMap will not have data with key `component_versions`
-            if main_versions_data:
-                config_map_data[product] = yaml.safe_dump(main_versions_data, default_flow_style=False)
-            else:
-                config_map_data[product] = yaml.safe_dump({}, default_flow_style=False)
-        return config_map_data, product_config_map_data_list
+            config_map_data[product] = main_versions_yaml
+        return config_map_data, product_config_map_data
 
-    def rename_config_map(self, rename_from, rename_to, namespace, label):
-        """ Renaming is actually deleting one ConfigMap and then updating the name of other ConfigMap and patching it.
+    def rename_config_map(self, rename_from, rename_to, namespace, label, resource_version=None):
+        """ Renaming is actually replacing the contents of one ConfigMap with those of the other and then
+        deleting the other ConfigMap.
+
+        Failed requests are retried with backoff by the Kubernetes API client, so each step is attempted once.
         :param str rename_from: Name of ConfigMap to rename
         :param str rename_to: Name of ConfigMap after rename
         :param str namespace: Namespace in which ConfigMap has to be updated
         :param dict label: Label of ConfigMap to be renamed
+        :param str resource_version: If set, only replace rename_to if it still has this resourceVersion
         :return: bool, If Success True else False
         """
 
-        if not self.k8s_obj.delete_config_map(rename_to, namespace):
-            LOGGER.error("Failed to delete ConfigMap %s", rename_to)
+        response = self.k8s_obj.read_config_map(rename_from, namespace)
+        if not response:
+            LOGGER.error("Failed to read ConfigMap %s", rename_from)
             return False
-        attempt = 0
-        del_failed = False
-
-        while attempt < 10:
-            attempt += 1
-            response = self.k8s_obj.read_config_map(rename_from, namespace)
-            if not response:
-                LOGGER.error("Failed to read ConfigMap %s, retrying..", rename_from)
-                continue
-            cm_data = response.data
-
-            if self.k8s_obj.create_config_map(rename_to, namespace, cm_data, label):
-                if self.k8s_obj.delete_config_map(rename_from, namespace):
-                    LOGGER.info("Renaming ConfigMap successful")
-                    return True
-                LOGGER.error("Failed to delete ConfigMap %s, retrying..", rename_from)
-                del_failed = True
-                break
-            LOGGER.error("Failed to create ConfigMap %s, retrying..", rename_to)
-        # Since only delete of backed up ConfigMap failed, retrying only delete operation
-        attempt = 0
-        if del_failed:
-            while attempt < 10:
-                attempt += 1
-                if self.k8s_obj.delete_config_map(rename_from, namespace):
-                    del_failed = False
-                    break
-                LOGGER.error("Failed to delete ConfigMap %s, retrying..", rename_from)
+
+        # Replacing in place, rather than deleting and re-creating, means rename_to never goes missing
+        if not self.k8s_obj.apply_config_map(rename_to, namespace, response.data, label,
+                                             resource_version=resource_version):
+            LOGGER.error("Failed to replace ConfigMap %s", rename_to)
+            return False
+
+        if not self.k8s_obj.delete_config_map(rename_from, namespace):
             # Returning success as migration is successful only backed up ConfigMap is not deleted.
-            if del_failed:
-                LOGGER.info("Failed to delete ConfigMap %s, but migration is successful", rename_from)
-            else:
-                LOGGER.info("Renaming ConfigMap successful")
+            LOGGER.info("Failed to delete ConfigMap %s, but migration is successful", rename_from)
             return True
-        return False
+
+        LOGGER.info("Renaming ConfigMap successful")
+        return True
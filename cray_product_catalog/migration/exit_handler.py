@@ -1,6 +1,6 @@
 # MIT License
 #
-# (C) Copyright 2023-2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2023-2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -27,12 +27,12 @@ c. Rollback case
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
-from re import fullmatch
 
 
-from cray_product_catalog.migration import CRAY_DATA_CATALOG_LABEL, \
-    PRODUCT_CONFIG_MAP_PATTERN
+from cray_product_catalog.constants import PRODUCT_CONFIG_MAP_LABEL_STR
+from cray_product_catalog.migration import CONFIG_MAP_TEMP, MAX_WORKERS, PRODUCT_CONFIG_MAP_PATTERN
 from cray_product_catalog.migration import PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE
 from cray_product_catalog.migration.kube_apis import KubernetesApi
 
@@ -43,11 +43,7 @@ def _is_product_config_map(config_map_name: str) -> bool:
     """Function to check product ConfigMap pattern.
     Returns True if pattern match found
     """
-    if config_map_name is None or config_map_name == "":
-        return False
-    if fullmatch(PRODUCT_CONFIG_MAP_PATTERN, config_map_name):
-        return True
-    return False
+    return bool(config_map_name) and PRODUCT_CONFIG_MAP_PATTERN.fullmatch(config_map_name) is not None
 
 
 class ExitHandler:
@@ -55,15 +51,32 @@ class ExitHandler:
 
     def __init__(self):
         self.k8api = KubernetesApi()  # Kubernetes API object
+        self._cm_list_cache = {}  # (label, namespace) -> names of product ConfigMaps
 
     def __get_all_created_product_config_maps(self) -> List:
-        """Get all created product ConfigMaps"""
-        cm_name = filter(_is_product_config_map,
-                         self.k8api.list_config_map_names(
-                             label=CRAY_DATA_CATALOG_LABEL,
-                             namespace=PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE)
-                         )
-        return list(cm_name)
+        """Get all created product ConfigMaps, using the product ConfigMap label to select them
+
+        The names are cached until the ConfigMaps are deleted or the rollback finishes.
+        """
+        key = (PRODUCT_CONFIG_MAP_LABEL_STR, PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE)
+        if key not in self._cm_list_cache:
+            # the name pattern is still checked in case any other ConfigMap has the label
+            self._cm_list_cache[key] = list(filter(_is_product_config_map,
+                                                   self.k8api.list_config_map_names(
+                                                       label=PRODUCT_CONFIG_MAP_LABEL_STR,
+                                                       namespace=PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE)
+                                                   ))
+        return list(self._cm_list_cache[key])
+
+    def __delete_product_config_map(self, config_map) -> bool:
+        """Delete a product ConfigMap. Returns True if it was deleted"""
+        LOGGER.debug("Deleting product ConfigMap %s", config_map)
+        if not self.k8api.delete_config_map(name=config_map, namespace=PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE):
+            return False
+        for names in self._cm_list_cache.values():
+            if config_map in names:
+                names.remove(config_map)
+        return True
 
     def rollback(self):
         """Method to handle roll back
@@ -71,14 +84,25 @@ class ExitHandler:
         whose names are determined using the pattern PRODUCT_CONFIG_MAP_PATTERN
         """
         LOGGER.warning("Initiating rollback")
-        product_config_maps = self.__get_all_created_product_config_maps()  # collecting product ConfigMaps
-
-        LOGGER.info("Deleting product ConfigMaps")  # attempting to delete product ConfigMaps
-        non_deleted_product_config_maps = []
-        for config_map in product_config_maps:
-            LOGGER.debug("Deleting product ConfigMap %s", config_map)
-            if not self.k8api.delete_config_map(name=config_map, namespace=PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE):
-                non_deleted_product_config_maps.append(config_map)
+        try:
+            self.__rollback()
+        finally:
+            # product ConfigMaps may be created again before the next rollback
+            self._cm_list_cache.clear()
+
+    def __rollback(self):
+        """Delete the temporary and product ConfigMaps"""
+
+        LOGGER.info("Deleting product ConfigMaps")
+        # collecting product ConfigMaps; the temporary ConfigMap does not have the product ConfigMap label
+        product_config_maps = [CONFIG_MAP_TEMP] + self.__get_all_created_product_config_maps()
+
+        # attempting to delete product ConfigMaps, concurrently
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            deleted = list(executor.map(self.__delete_product_config_map, product_config_maps))
+        non_deleted_product_config_maps = [
+            config_map for config_map, is_deleted in zip(product_config_maps, deleted) if not is_deleted
+        ]
 
         if non_deleted_product_config_maps:  # checking if any product ConfigMap is not deleted
             LOGGER.error("Error deleting ConfigMaps: %s. Delete these manually",
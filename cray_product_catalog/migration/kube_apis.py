@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2023-2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2023-2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -26,52 +26,102 @@
 Kubernets API
 """
 
+import json
 import logging
+import threading
 from kubernetes import client
 from kubernetes.client.rest import ApiException
 from kubernetes.client.api_client import ApiClient
-from kubernetes.client.models.v1_config_map import V1ConfigMap
-from kubernetes.client.models.v1_object_meta import V1ObjectMeta
-from urllib3.util.retry import Retry
 from urllib3.exceptions import MaxRetryError
+from cray_product_catalog.constants import PRODUCT_CATALOG_FIELD_MANAGER
 from cray_product_catalog.logging import configure_logging
-from cray_product_catalog.util.k8s import load_k8s
-from . import RETRY_COUNT
+from cray_product_catalog.util.k8s import get_api_retry, load_k8s
+from . import CONNECTION_POOL_MAXSIZE, RETRY_COUNT
+
+
+# Ask for only the metadata of objects, falling back to the full objects
+METADATA_ACCEPT = 'application/json;as=PartialObjectMetadata;v=v1;g=meta.k8s.io,application/json'
+METADATA_LIST_ACCEPT = 'application/json;as=PartialObjectMetadataList;v=v1;g=meta.k8s.io,application/json'
+
+_API_LOCK = threading.Lock()
+_SHARED_API = None
+
+
+def _get_shared_api():
+    """Get the CoreV1Api shared by all KubernetesApi instances
+
+    Logging, the Kubernetes configuration and the client with its connection pool
+    are set up the first time this is called, so later instances reuse connections.
+    :return: CoreV1Api
+    """
+    global _SHARED_API  # pylint: disable=global-statement
+    with _API_LOCK:
+        if _SHARED_API is None:
+            configure_logging()
+            load_k8s()
+
+            configuration = client.Configuration.get_default_copy()
+            configuration.connection_pool_maxsize = CONNECTION_POOL_MAXSIZE
+            configuration.retries = get_api_retry(RETRY_COUNT)
+            kclient = ApiClient(configuration=configuration)
+            # the client can only decode JSON, so ask for large responses to be compressed instead
+            kclient.set_default_header('Accept-Encoding', 'gzip')
+            _SHARED_API = client.CoreV1Api(kclient)
+        return _SHARED_API
+
+
+def _config_map_body(name, data, label, resource_version=None):
+    """Build the body of a ConfigMap request
+
+    A plain dict is serialized as it is, without building and converting V1ConfigMap models.
+    :param str name: ConfigMap name
+    :param dict data: Content of ConfigMap
+    :param dict label: Labels of ConfigMap
+    :param str resource_version: resourceVersion the ConfigMap must have, if any
+    :return: dict
+    """
+    metadata = {'name': name, 'labels': label}
+    if resource_version is not None:
+        metadata['resourceVersion'] = resource_version
+    return {'apiVersion': 'v1', 'kind': 'ConfigMap', 'metadata': metadata, 'data': data}
 
 
 class KubernetesApi:
     """Class for wrapping Kubernetes API"""
     def __init__(self):
-        configure_logging()
         self.logger = logging.getLogger(__name__)
-        load_k8s()
-
-        retry = Retry(
-            total=RETRY_COUNT, read=RETRY_COUNT, connect=RETRY_COUNT, backoff_factor=0.3,
-            status_forcelist=(500, 502, 503, 504)
-        )
-        self.kclient = ApiClient()
-        self.kclient.rest_client.pool_manager.connection_pool_kw['retries'] = retry
-        self.api_instance = client.CoreV1Api(self.kclient)
+        self.api_instance = _get_shared_api()
 
     def create_config_map(self, name, namespace, data, label):
-        """Creates ConfigMap
+        """Creates ConfigMap, or replaces it if it already exists
         :param dict data: Content of ConfigMap
         :param str name: ConfigMap name to be created
         :param str namespace: Namespace in which ConfigMap has to be created
         :param dict label: Label with which ConfigMap has to be created
         :return: bool
         """
+        body = _config_map_body(name, data, label)
         try:
-            cm_body = V1ConfigMap(
-                metadata=V1ObjectMeta(
-                    name=name,
-                    labels=label
-                ),
-                data=data
-            )
             self.api_instance.create_namespaced_config_map(
-                namespace=namespace, body=cm_body
+                namespace=namespace, body=body, field_manager=PRODUCT_CATALOG_FIELD_MANAGER
+            )
+            return True
+        except MaxRetryError as err:
+            self.logger.exception('MaxRetryError: %s', err)
+            return False
+        except ApiException as err:
+            if err.status != 409:
+                # The full string representation of ApiException is very long, so just log err.reason.
+                self.logger.exception('ApiException: %s', err.reason)
+                return False
+
+        # e.g. left behind by an earlier migration attempt; make it match the desired state.
+        # This is only tried once, and does not create the ConfigMap again if it has been deleted,
+        # as apply_config_map would.
+        self.logger.info("ConfigMap %s/%s already exists, replacing it", namespace, name)
+        try:
+            self.api_instance.replace_namespaced_config_map(
+                name, namespace, body, field_manager=PRODUCT_CATALOG_FIELD_MANAGER
             )
             return True
         except MaxRetryError as err:
@@ -82,47 +132,89 @@ class KubernetesApi:
             self.logger.exception('ApiException: %s', err.reason)
             return False
 
-    def list_config_map(self, namespace, label):
-        """ Reads all the ConfigMaps with certain label in particular namespace
-        :param str namespace: Value of namespace from where ConfigMap has to be listed
-        :param str label: String format of label "type=xyz"
-        :return: V1ConfigMapList
-                 If there is any error, returns None
+    def apply_config_map(self, name, namespace, data, label, resource_version=None):
+        """Replaces the ConfigMap, or creates it if it does not exist
+        :param str name: ConfigMap name to be replaced or created
+        :param str namespace: Namespace in which ConfigMap has to be replaced or created
+        :param dict data: Content of ConfigMap
+        :param dict label: Label with which ConfigMap has to be replaced or created
+        :param str resource_version: If set, only replace the ConfigMap if it still has this
+                                     resourceVersion, and do not create it
+        :return: bool
         """
-        if not all((label, namespace)):
-            self.logger.info("Either label or namespace is empty, not reading ConfigMap.")
-            return None
         try:
-            return self.api_instance.list_namespaced_config_map(namespace, label_selector=label).items
+            self.api_instance.replace_namespaced_config_map(
+                name, namespace, _config_map_body(name, data, label, resource_version),
+                field_manager=PRODUCT_CATALOG_FIELD_MANAGER
+            )
+            return True
         except MaxRetryError as err:
             self.logger.exception('MaxRetryError: %s', err)
-            return None
+            return False
         except ApiException as err:
+            if err.status == 404 and resource_version is None:
+                # create_config_map replaces it at most once if it exists again, so this cannot loop
+                return self.create_config_map(name, namespace, data, label)
+            if err.status == 409:
+                self.logger.info("ConfigMap %s/%s has been modified, not replacing it", namespace, name)
+                return False
             # The full string representation of ApiException is very long, so just log err.reason.
             self.logger.exception('ApiException: %s', err.reason)
-            return None
+            return False
+
+    def _get_metadata(self, path, path_params, accept, query_params=None):
+        """Reads only the metadata of ConfigMaps as JSON
+
+        The CoreV1Api methods cannot set the Accept header, so the API is called directly.
+        :param str path: API path of the ConfigMap or ConfigMaps
+        :param dict path_params: Values of the parameters in path
+        :param str accept: METADATA_ACCEPT or METADATA_LIST_ACCEPT
+        :param list query_params: Query parameters as (name, value) tuples
+        :return: dict
+        :raises MaxRetryError, ApiException, ValueError: if the request or parsing the response fails
+        """
+        response = self.api_instance.api_client.call_api(
+            path, 'GET',
+            path_params=path_params,
+            query_params=query_params or [],
+            header_params={'Accept': accept},
+            auth_settings=['BearerToken'],
+            _return_http_data_only=True,
+            _preload_content=False
+        )
+        return json.loads(response.data)
 
     def list_config_map_names(self, namespace, label):
-        """ Reads all the ConfigMaps with certain label in particular namespace
+        """ Reads the names of all the ConfigMaps with certain label in particular namespace
+
+        Only the metadata of the ConfigMaps is requested, and only the names are read
+        from the JSON response, rather than deserializing every ConfigMap into a V1ConfigMap.
         :param str namespace: Value of namespace from where ConfigMap has to be listed
         :param str label: String format of label "type=xyz"
         :return: [str]
         """
-        cm_output = self.list_config_map(namespace, label)
-
-        list_cm_names = []
-
-        if not cm_output:
-            return list_cm_names
-
-        # parse the output to get only names
-        for cm in cm_output:
-            try:
-                list_cm_names.append(cm.metadata.name)
-            except Exception:
-                continue
+        if not all((label, namespace)):
+            self.logger.info("Either label or namespace is empty, not reading ConfigMap.")
+            return []
+        try:
+            cm_output = self._get_metadata(
+                '/api/v1/namespaces/{namespace}/configmaps', {'namespace': namespace},
+                METADATA_LIST_ACCEPT, query_params=[('labelSelector', label)]
+            ).get('items') or []
+        except MaxRetryError as err:
+            self.logger.exception('MaxRetryError: %s', err)
+            return []
+        except ApiException as err:
+            # The full string representation of ApiException is very long, so just log err.reason.
+            self.logger.exception('ApiException: %s', err.reason)
+            return []
+        except ValueError as err:
+            self.logger.exception('Unable to parse list of ConfigMaps: %s', err)
+            return []
 
-        return list_cm_names
+        # parse the output to get only names, skipping any item without one
+        metadata = (cm.get('metadata') or {} for cm in cm_output)
+        return [meta['name'] for meta in metadata if meta.get('name')]
 
     def read_config_map(self, name, namespace):
         """Reads ConfigMap based on provided name and namespace
@@ -133,7 +225,7 @@ class KubernetesApi:
         """
         # Check if both values are not empty
         if not all((name, namespace)):
-            self.logger.exception("Either name or namespace is empty, not reading ConfigMap.")
+            self.logger.info("Either name or namespace is empty, not reading ConfigMap.")
             return None
         try:
             return self.api_instance.read_namespaced_config_map(name, namespace)
@@ -145,12 +237,44 @@ class KubernetesApi:
             self.logger.exception('ApiException: %s', err.reason)
             return None
 
+    def read_config_map_labels(self, name, namespace):
+        """Reads the labels of the ConfigMap based on provided name and namespace
+
+        Only the metadata of the ConfigMap is requested, rather than all of its data.
+        :param Str name: Name of ConfigMap to read
+        :param Str namespace: Namespace from which ConfigMap has to be read
+        :return: dict
+                 Returns None in case of any error
+        """
+        if not all((name, namespace)):
+            self.logger.info("Either name or namespace is empty, not reading ConfigMap.")
+            return None
+        try:
+            metadata = self._get_metadata(
+                '/api/v1/namespaces/{namespace}/configmaps/{name}', {'namespace': namespace, 'name': name},
+                METADATA_ACCEPT
+            ).get('metadata') or {}
+        except MaxRetryError as err:
+            self.logger.exception('MaxRetryError: %s', err)
+            return None
+        except ApiException as err:
+            # The full string representation of ApiException is very long, so just log err.reason.
+            self.logger.exception('ApiException: %s', err.reason)
+            return None
+        except ValueError as err:
+            self.logger.exception('Unable to parse ConfigMap: %s', err)
+            return None
+        return metadata.get('labels') or {}
+
     def delete_config_map(self, name, namespace):
         """Delete the ConfigMap
         :param Str name: Name of ConfigMap to be deleted
         :param Str namespace: Namespace from which ConfigMap has to be deleted
-        :return: bool; If success True else False
+        :return: bool; If success, or the ConfigMap does not exist, True else False
         """
+        if not all((name, namespace)):
+            self.logger.info("Either name or namespace is empty, not deleting ConfigMap.")
+            return False
         try:
             self.api_instance.delete_namespaced_config_map(name, namespace)
             return True
@@ -158,6 +282,9 @@ class KubernetesApi:
             self.logger.exception('MaxRetryError: %s', err)
             return False
         except ApiException as err:
+            if err.status == 404:
+                self.logger.info("ConfigMap %s/%s does not exist, nothing to delete", namespace, name)
+                return True
             # The full string representation of ApiException is very long, so just log err.reason.
             self.logger.exception('ApiException: %s', err.reason)
             return False
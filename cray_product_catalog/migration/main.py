@@ -2,7 +2,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2023-2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2023-2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -31,6 +31,7 @@ If the split is not succesful then it rollbacks to its initial state where Confi
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from cray_product_catalog.constants import PRODUCT_CATALOG_CONFIG_MAP_LABEL, PRODUCT_CATALOG_CONFIG_MAP_LABEL_KEY
 from cray_product_catalog.migration.config_map_data_handler import ConfigMapDataHandler
@@ -46,18 +47,17 @@ LOGGER = logging.getLogger(__name__)
 
 def is_migrated():
     """
-    Check if ConfigMap is already migrated.
+    Check if ConfigMap is already migrated, reading only its labels.
     Returns True if so, False if not.
     """
     config_map_obj = ConfigMapDataHandler()
     try:
-        main_cm = config_map_obj.k8s_obj.read_config_map(
+        labels = config_map_obj.k8s_obj.read_config_map_labels(
             PRODUCT_CATALOG_CONFIG_MAP_NAME, PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE
         )
     except Exception:
         LOGGER.error("Error reading ConfigMap...")
         return False
-    labels = main_cm.metadata.labels
     if labels and labels.get(PRODUCT_CATALOG_CONFIG_MAP_LABEL_KEY) == PRODUCT_CATALOG_CONFIG_MAP_NAME:
         return True
 
@@ -77,15 +77,18 @@ def main():
     exit_handler = ExitHandler()
     attempt = 0
     max_attempts = 2
-    migration_failed = False
+    # products whose ConfigMaps were created by the previous attempt
+    created_products = set()
+    # ConfigMap read by the previous attempt
+    response = None
 
     while attempt < max_attempts:
         attempt += 1
-        migration_failed = False
-        curr_resource_version = ''
-        response = config_map_obj.k8s_obj.read_config_map(
-            PRODUCT_CATALOG_CONFIG_MAP_NAME, PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE
-            )
+        # Reuse the ConfigMap read by the previous attempt, if there is one
+        if response is None:
+            response = config_map_obj.k8s_obj.read_config_map(
+                PRODUCT_CATALOG_CONFIG_MAP_NAME, PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE
+                )
         if response:
             if not response.metadata.resource_version:
                 LOGGER.error("Error reading resourceVersion, exiting migration process...")
@@ -100,61 +103,60 @@ def main():
             raise SystemExit(1)
 
         try:
-            main_config_map_data, product_config_map_data_list = config_map_obj.migrate_config_map_data(config_map_data)
+            main_config_map_data, product_config_map_data = config_map_obj.migrate_config_map_data(config_map_data)
         except Exception:
             LOGGER.error("Failed to split ConfigMap Data, exiting migration process...")
             raise SystemExit(1)
 
-        # Create ConfigMaps for each product with `component_versions` data
-        if not config_map_obj.create_product_config_maps(product_config_map_data_list):
+        # Create ConfigMaps for each product with `component_versions` data and, concurrently, the
+        # temporary main ConfigMap with all data except `component_versions` for all products
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            temp_config_map_future = executor.submit(config_map_obj.create_temp_config_map, main_config_map_data)
+            product_config_maps_created = config_map_obj.create_product_config_maps(product_config_map_data)
+            temp_config_map_created = temp_config_map_future.result()
+        if not (product_config_maps_created and temp_config_map_created):
             LOGGER.info("Calling rollback handler...")
             exit_handler.rollback()
             raise SystemExit(1)
-        # Create temporary main ConfigMap with all data except `component_versions` for all products
-        if not config_map_obj.create_temp_config_map(main_config_map_data):
-            LOGGER.info("Calling rollback handler...")
+
+        # The ConfigMaps created by the previous attempt were replaced above, except those of removed products
+        removed_products = created_products.difference(product_config_map_data)
+        if removed_products and not config_map_obj.delete_product_config_maps(removed_products):
+            LOGGER.info("Deleting ConfigMaps of removed products failed, calling rollback handler...")
             exit_handler.rollback()
             raise SystemExit(1)
 
-        LOGGER.info("Verifying resource_version value is same to confirm there is no change in %s",
-                    PRODUCT_CATALOG_CONFIG_MAP_NAME)
+        LOGGER.info("Renaming %s ConfigMap name to %s ConfigMap",
+                    CONFIG_MAP_TEMP, PRODUCT_CATALOG_CONFIG_MAP_NAME)
 
+        # Replacing main ConfigMap `cray-product-catalog` with the data in `cray-product-catalog-temp`;
+        # the replace is conditional on resource_version, so it fails if the ConfigMap has been changed
+        if config_map_obj.rename_config_map(
+            CONFIG_MAP_TEMP, PRODUCT_CATALOG_CONFIG_MAP_NAME,
+            PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE, PRODUCT_CATALOG_CONFIG_MAP_LABEL,
+            resource_version=init_resource_version
+        ):
+            LOGGER.info("Migration successful")
+            return
+
+        # Only read the ConfigMap again to find out whether the rename failed because it was changed
         response = config_map_obj.k8s_obj.read_config_map(
             PRODUCT_CATALOG_CONFIG_MAP_NAME, PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE
             )
-        if response:
-            if not response.metadata.resource_version:
-                LOGGER.error("Error reading resourceVersion, exiting migration process...")
-                exit_handler.rollback()
-                raise SystemExit(1)
-            curr_resource_version = response.metadata.resource_version
-
-        if curr_resource_version != init_resource_version:
-            migration_failed = True
+        if response and response.metadata.resource_version not in (None, init_resource_version):
             LOGGER.info("resource_version has changed, so cannot rename %s ConfigMap to %s ConfigMap",
                         CONFIG_MAP_TEMP, PRODUCT_CATALOG_CONFIG_MAP_NAME)
-            LOGGER.info("Re-trying migration process...")
-            exit_handler.rollback()
-            continue
-        break
-
-    if migration_failed:
-        LOGGER.info("ConfigMap %s is modified by other process, exiting migration process...",
-                    PRODUCT_CATALOG_CONFIG_MAP_NAME)
-        raise SystemExit(1)
-
-    LOGGER.info("Renaming %s ConfigMap name to %s ConfigMap",
-                CONFIG_MAP_TEMP, PRODUCT_CATALOG_CONFIG_MAP_NAME)
-
-    # Creating main ConfigMap `cray-product-catalog` using the data in `cray-product-catalog-temp`
-    if config_map_obj.rename_config_map(
-        CONFIG_MAP_TEMP, PRODUCT_CATALOG_CONFIG_MAP_NAME,
-        PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE, PRODUCT_CATALOG_CONFIG_MAP_LABEL
-    ):
-        LOGGER.info("Migration successful")
-    else:
-        LOGGER.info("Renaming %s to %s ConfigMap failed, calling rollback handler...",
-                    CONFIG_MAP_TEMP, PRODUCT_CATALOG_CONFIG_MAP_NAME)
+            if attempt < max_attempts:
+                # The next attempt migrates the modified ConfigMap that was just read, replacing
+                # the ConfigMaps created by this attempt rather than rolling them back first
+                LOGGER.info("Re-trying migration process...")
+                created_products = set(product_config_map_data)
+                continue
+            LOGGER.info("ConfigMap %s is modified by other process, calling rollback handler...",
+                        PRODUCT_CATALOG_CONFIG_MAP_NAME)
+        else:
+            LOGGER.info("Renaming %s to %s ConfigMap failed, calling rollback handler...",
+                        CONFIG_MAP_TEMP, PRODUCT_CATALOG_CONFIG_MAP_NAME)
         exit_handler.rollback()
         raise SystemExit(1)
 
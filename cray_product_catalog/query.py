@@ -1,6 +1,6 @@
 # MIT License
 #
-# (C) Copyright 2021-2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2021-2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -25,14 +25,14 @@ Defines classes for querying for information about the installed products.
 """
 
 import logging
-from pkg_resources import parse_version
+from operator import itemgetter
 
-from jsonschema.exceptions import ValidationError
 from kubernetes.client import CoreV1Api
 from kubernetes.client.rest import ApiException
 from kubernetes.config import ConfigException
+from packaging.version import InvalidVersion, Version
 from urllib3.exceptions import MaxRetryError
-from yaml import safe_load, YAMLError
+from yaml import YAMLError
 
 from cray_product_catalog.constants import (
     COMPONENT_DOCKER_KEY,
@@ -45,17 +45,37 @@ from cray_product_catalog.constants import (
     PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
     PRODUCT_CATALOG_CONFIG_MAP_LABEL_STR
 )
-from cray_product_catalog.schema.validate import validate
 from cray_product_catalog.util import load_k8s
-from cray_product_catalog.util.merge_dict import merge_dict
+from cray_product_catalog.util.merge_dict import merge_dict_into
+from cray_product_catalog.util.yaml_helper import load_yaml
 
 LOGGER = logging.getLogger(__name__)
 
+# Get the identifying fields of a component as a tuple
+_name_and_version = itemgetter('name', 'version')
+_bucket_and_key = itemgetter('bucket', 'key')
+
 
 class ProductCatalogError(Exception):
     """An error occurred reading or manipulating product installs."""
 
 
+def _version_key(version):
+    """Get a key to sort product versions by.
+
+    Args:
+        version (str): The product version.
+
+    Returns:
+        A tuple which sorts versions that are not valid PEP 440 versions before
+        all valid versions, as pkg_resources.parse_version did.
+    """
+    try:
+        return 1, Version(version)
+    except InvalidVersion:
+        return 0, version
+
+
 class ProductCatalog:
     """A collection of installed product versions.
 
@@ -63,7 +83,8 @@ class ProductCatalog:
         name (str): The product catalog Kubernetes ConfigMap name.
         namespace (str): The product catalog Kubernetes ConfigMap namespace.
         products ([InstalledProductVersion]): A list of installed product
-            versions.
+            versions. It may be reassigned or added to; replace an item by
+            reassigning the list rather than setting the item in place.
     """
     @staticmethod
     def _get_k8s_api():
@@ -144,18 +165,40 @@ class ProductCatalog:
                     f'Failed to load ConfigMap data: {err}'
                 ) from err
 
-        invalid_products = [
-            str(p) for p in self.products if not p.is_valid
-        ]
+        # validate each product once, splitting them into valid and invalid products
+        valid_products = []
+        invalid_products = []
+        for product in self.products:
+            (valid_products if product.is_valid else invalid_products).append(product)
         if invalid_products:
             LOGGER.warning(
                 'The following products have product catalog data that is not valid against the expected schema: %s',
-                ", ".join(invalid_products)
+                ", ".join(str(p) for p in invalid_products)
             )
 
-        self.products = [
-            p for p in self.products if p.is_valid
-        ]
+        self.products = valid_products
+        # index of the products by name, built from self.products when it is first needed
+        self._products_by_name = None
+        self._indexed_products = None
+        self._indexed_count = 0
+
+    def _get_products_by_name(self):
+        """Get the products indexed by name, so looking one up does not scan every product.
+
+        The index is built again if `products` has been reassigned or its
+        length has changed since it was last built.
+
+        Returns:
+            dict: lists of InstalledProductVersions keyed by product name.
+        """
+        if (self._products_by_name is None or self._indexed_products is not self.products
+                or self._indexed_count != len(self.products)):
+            self._products_by_name = {}
+            for product in self.products:
+                self._products_by_name.setdefault(product.name, []).append(product)
+            self._indexed_products = self.products
+            self._indexed_count = len(self.products)
+        return self._products_by_name
 
     def get_product(self, name, version=None):
         """Get the InstalledProductVersion matching the given name/version.
@@ -172,19 +215,15 @@ class ProductCatalog:
             ProductCatalogError: If there is more than one matching
                 InstalledProductVersion, or if there are none.
         """
+        matching_name_products = self._get_products_by_name().get(name, [])
         if not version:
-            matching_name_products = [product for product in self.products if product.name == name]
             if not matching_name_products:
                 raise ProductCatalogError(f'No installed products with name {name}.')
-            latest = sorted(matching_name_products,
-                            key=lambda p: parse_version(p.version))[-1]
+            latest = max(matching_name_products, key=lambda p: _version_key(p.version))
             LOGGER.debug('Using latest version (%s) of product %s', latest.version, name)
             return latest
 
-        matching_products = [
-            product for product in self.products
-            if product.name == name and product.version == version
-        ]
+        matching_products = [product for product in matching_name_products if product.version == version]
         if not matching_products:
             raise ProductCatalogError(
                 f'No installed products with name {name} and version {version}.'
@@ -209,7 +248,7 @@ def load_cm_data(config_map):
     return [
         InstalledProductVersion(product_name, product_version, product_version_data)
         for product_name, product_versions in config_map.data.items()
-        for product_version, product_version_data in safe_load(product_versions).items()
+        for product_version, product_version_data in load_yaml(product_versions).items()
     ]
 
 
@@ -228,15 +267,15 @@ def load_config_map_data(name, configmaps):
         if not cm.metadata.name.startswith(name):
             continue
         for product_name, product_versions in cm.data.items():
-            for product_version, product_version_data in safe_load(product_versions).items():
-                cm_key = product_name + ':' + product_version
+            for product_version, product_version_data in load_yaml(product_versions).items():
+                cm_key = (product_name, product_version)
                 if cm_key in config_map_data:
-                    config_map_data[cm_key] = merge_dict(config_map_data[cm_key], product_version_data)
-                else:
-                    config_map_data[cm_key] = product_version_data
+                    # both were just loaded, so merge without copying either
+                    merge_dict_into(config_map_data[cm_key], product_version_data)
+                config_map_data[cm_key] = product_version_data
     return [
-        InstalledProductVersion(key.split(':',)[0], key.split(':')[1], product_version_data)
-        for key, product_version_data in config_map_data.items()
+        InstalledProductVersion(product_name, product_version, product_version_data)
+        for (product_name, product_version), product_version_data in config_map_data.items()
     ]
 
 
@@ -262,6 +301,15 @@ class InstalledProductVersion:
     @property
     def is_valid(self):
         """bool: True if this product's version data fits the schema."""
+        # data that is not a mapping, e.g. an empty version in the YAML, can never fit the schema
+        if not isinstance(self.data, dict):
+            return False
+
+        # jsonschema is slow to import and only needed once product data is validated
+        # pylint: disable=import-outside-toplevel
+        from jsonschema.exceptions import ValidationError
+        from cray_product_catalog.schema.validate import validate
+
         try:
             validate(self.data)
             return True
@@ -280,8 +328,7 @@ class InstalledProductVersion:
         Returns:
             A list of tuples of (image_name, image_version)
         """
-        return [(component['name'], component['version'])
-                for component in self.component_data.get(COMPONENT_DOCKER_KEY) or []]
+        return list(map(_name_and_version, self.component_data.get(COMPONENT_DOCKER_KEY) or []))
 
     @property
     def helm_charts(self):
@@ -290,8 +337,7 @@ class InstalledProductVersion:
         Returns:
             A list of tuples of (chart_name, chart_version)
         """
-        return [(component['name'], component['version'])
-                for component in self.component_data.get(COMPONENT_HELM) or []]
+        return list(map(_name_and_version, self.component_data.get(COMPONENT_HELM) or []))
 
     @property
     def s3_artifacts(self):
@@ -300,8 +346,7 @@ class InstalledProductVersion:
         Returns:
             A list of tuples of (artifact bucket, artifact key)
         """
-        return [(component['bucket'], component['key'])
-                for component in self.component_data.get(COMPONENT_S3) or []]
+        return list(map(_bucket_and_key, self.component_data.get(COMPONENT_S3) or []))
 
     @property
     def loftsman_manifests(self):
@@ -335,9 +380,13 @@ class InstalledProductVersion:
         which are listed only as members of any of the group repos
         """
         # Get all hosted repositories, plus any repos that might be under a group repo's "members" list.
-        repository_names = set(repo.get('name') for repo in self.hosted_repositories)
-        for group_repo in self.group_repositories:
-            repository_names |= set(group_repo.get('members'))
+        repository_names = set()
+        for repo in self.repositories:
+            repo_type = repo.get('type')
+            if repo_type == 'hosted':
+                repository_names.add(repo.get('name'))
+            elif repo_type == 'group':
+                repository_names.update(repo.get('members'))
 
         return repository_names
 
@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2021-2023 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2021-2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -26,13 +26,30 @@
 Validate data based on specified schema file
 """
 
+from functools import lru_cache
 import pkgutil
 
 import jsonschema
+from jsonschema.exceptions import best_match
 import yaml
 
 
+@lru_cache(maxsize=None)
+def get_validator():
+    """Get a validator for the schema defined in schema.yaml.
+
+    The schema is loaded and checked against its metaschema only the first
+    time this is called; later calls return the same validator.
+    """
+    schema = yaml.safe_load(pkgutil.get_data(__name__, 'schema.yaml'))
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema)
+
+
 def validate(data):
     """Use the schema defined in schema.yaml to validate the given data."""
-    schema_data = pkgutil.get_data(__name__, 'schema.yaml')
-    return jsonschema.validate(data, yaml.safe_load(schema_data))
+    # raise the same error as jsonschema.validate, without checking the schema again
+    error = best_match(get_validator().iter_errors(data))
+    if error is not None:
+        raise error
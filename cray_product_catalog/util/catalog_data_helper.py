@@ -1,6 +1,6 @@
 # MIT License
 #
-# (C) Copyright 2023-2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2023-2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -25,25 +25,25 @@ Contains a utility function for splitting `cray-product-catalog` data.
 """
 
 import re
+from functools import lru_cache
 
 from cray_product_catalog.constants import (
     PRODUCT_CM_FIELDS
 )
 
+# A valid ConfigMap name: lowercase alphanumeric, '-' or '.', starting and ending alphanumeric
+_CM_NAME_RE = re.compile(r'^([a-z0-9])*[a-z0-9.-]*([a-z0-9])$')
+
 
 def split_catalog_data(data):
     """Split the passed data into data needed by main and product ConfigMaps."""
-    all_unique_keys = set(data.keys())
-    comm_keys_bw_cms = all_unique_keys.intersection(PRODUCT_CM_FIELDS)
-
-    # If none of the PRODUCT_CM_FIELDS are available in all_unique_keys, then
-    # return empty dict as second return value
-    if not comm_keys_bw_cms:
-        return {key: data[key] for key in all_unique_keys - PRODUCT_CM_FIELDS}, {}
-    return {key: data[key] for key in all_unique_keys - PRODUCT_CM_FIELDS}, \
-        {key: data[key] for key in comm_keys_bw_cms}
+    main_cm_data, product_cm_data = {}, {}
+    for key, value in data.items():
+        (product_cm_data if key in PRODUCT_CM_FIELDS else main_cm_data)[key] = value
+    return main_cm_data, product_cm_data
 
 
+@lru_cache(maxsize=1024)
 def format_product_cm_name(config_map, product):
     """Formatting PRODUCT_CONFIG_NAME based on the product name passed and the same is used as key
     under data in the ConfigMap.
@@ -58,11 +58,12 @@ def format_product_cm_name(config_map, product):
     prohibited in the ConfigMap name, we convert underscores ('_') to hyphens ('-') and uppercase
     to lowercase.
     """
-    pat = re.compile('^([a-z0-9])*[a-z0-9.-]*([a-z0-9])$')
+    # Check the length before building the name. Formatting only changes the length of a name with
+    # non-ASCII characters, which lowercase to non-ASCII characters and so never match _CM_NAME_RE.
+    if len(config_map) + 1 + len(product) > 253:
+        return ''
     prod_config_map = config_map + '-' + product.replace('_', '-').lower()
 
-    if len(prod_config_map) > 253:
-        return ''
-    if not re.fullmatch(pat, prod_config_map):
+    if not _CM_NAME_RE.fullmatch(prod_config_map):
         return ''
     return prod_config_map
@@ -1,6 +1,6 @@
 # MIT License
 #
-# (C) Copyright 2021-2023 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2021-2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -22,10 +22,45 @@
 #
 
 """
-Defines a utility function for loading the Kubernetes configuration.
+Defines utility functions for loading the Kubernetes configuration, getting
+a shared Kubernetes API client, waiting on ConfigMaps and retrying updates
+which conflict.
 """
 
-from kubernetes import config
+import logging
+import random
+import threading
+import time
+
+from kubernetes import client, config, watch
+from kubernetes.client.api_client import ApiClient
+from kubernetes.client.rest import ApiException
+from urllib3.util.retry import Retry
+
+LOGGER = logging.getLogger(__name__)
+
+# kubernetes API response code
+ERR_CONFLICT = 409
+
+# Number of times to retry requests to the Kubernetes API which fail to connect
+# or fail with a server error
+API_RETRIES = 100
+
+# Minimum for the maximum number of connections to the Kubernetes API to keep in
+# the pool, so that concurrent requests reuse connections rather than opening and
+# discarding them. The kubernetes client default of five per CPU is kept if it is
+# larger.
+API_CONNECTION_POOL_MAXSIZE = 10
+
+# Maximum number of seconds to back off between retries of a request to the
+# Kubernetes API
+API_BACKOFF_MAX = 10.0
+
+_API_LOCK = threading.Lock()
+_API = None
+
+# Number of seconds to wait for a ConfigMap to be created before giving up
+WATCH_TIMEOUT = 60
 
 
 def load_k8s():
@@ -34,3 +69,145 @@ def load_k8s():
         config.load_incluster_config()
     except Exception:
         config.load_kube_config()
+
+
+class JitteredRetry(Retry):
+    """A urllib3 Retry whose exponential backoff is capped and jittered.
+
+    The backoff is capped at API_BACKOFF_MAX seconds and a random time up to
+    that backoff is used, so that clients which fail together do not all retry
+    at the same moment.
+    """
+
+    def get_backoff_time(self):
+        """Return a random backoff time up to the capped exponential backoff."""
+        return random.uniform(0, min(API_BACKOFF_MAX, super().get_backoff_time()))
+
+
+def get_api_retry(retries):
+    """Get the retry policy for requests to the Kubernetes API.
+
+    Requests which fail to connect or fail with a server error are retried
+    with capped, jittered exponential backoff.
+
+    Args:
+        retries (int): The maximum number of times to retry a request.
+
+    Returns:
+        JitteredRetry: The retry policy.
+    """
+    return JitteredRetry(
+        total=retries, read=retries, connect=retries, backoff_factor=0.3,
+        status_forcelist=(500, 502, 503, 504)
+    )
+
+
+def get_core_v1_api():
+    """Get a CoreV1Api which is shared by all callers.
+
+    The client and its connection pool are created the first time this is
+    called, so that later requests to the Kubernetes API reuse connections
+    rather than opening new ones. The Kubernetes configuration must already
+    have been loaded with `load_k8s`.
+
+    Returns:
+        CoreV1Api: The Kubernetes API.
+    """
+    global _API  # pylint: disable=global-statement
+    with _API_LOCK:
+        if _API is None:
+            configuration = client.Configuration.get_default_copy()
+            configuration.connection_pool_maxsize = max(API_CONNECTION_POOL_MAXSIZE,
+                                                        configuration.connection_pool_maxsize)
+            configuration.retries = get_api_retry(API_RETRIES)
+            k8sclient = ApiClient(configuration=configuration)
+            _API = client.CoreV1Api(k8sclient)
+        return _API
+
+
+def wait_for_config_map(api_instance, name, namespace, timeout=WATCH_TIMEOUT):
+    """Wait for a ConfigMap to exist in the given namespace.
+
+    Rather than repeatedly reading the ConfigMap until it appears, watch the
+    ConfigMaps in the namespace filtered to the given name, which returns as
+    soon as the ConfigMap is created.
+
+    Args:
+        api_instance (CoreV1Api): The Kubernetes API.
+        name (str): The name of the ConfigMap.
+        namespace (str): The namespace of the ConfigMap.
+        timeout (int): The number of seconds to wait for the ConfigMap.
+
+    Returns:
+        V1ConfigMap: the ConfigMap, or None if it did not appear within
+            `timeout` seconds.
+    """
+    watcher = watch.Watch()
+    for event in watcher.stream(api_instance.list_namespaced_config_map, namespace,
+                                field_selector=f"metadata.name={name}", timeout_seconds=timeout):
+        if event['type'] in ('ADDED', 'MODIFIED'):
+            watcher.stop()
+            return event['object']
+    LOGGER.warning("Timed out after %ss waiting for ConfigMap %s/%s", timeout, namespace, name)
+    return None
+
+
+class DecorrelatedJitter:
+    """Backoff delays with decorrelated jitter.
+
+    Each delay is chosen at random between `base` and three times the
+    previous delay, up to `cap`. This grows the delay under repeated
+    conflicts while spreading out processes which conflict at the same time.
+    """
+
+    __slots__ = ('base', 'cap', 'prev')
+
+    def __init__(self, base=0.05, cap=2.0):
+        """Create a new DecorrelatedJitter.
+
+        Args:
+            base (float): The minimum number of seconds to back off.
+            cap (float): The maximum number of seconds to back off.
+        """
+        self.base = base
+        self.cap = cap
+        self.prev = base
+
+    def next_backoff(self):
+        """Return the number of seconds to back off next."""
+        self.prev = min(self.cap, random.uniform(self.base, self.prev * 3))
+        return self.prev
+
+
+def retry_on_conflict(func, steps=5, base=0.05, cap=2.0):
+    """Call a function, retrying with jittered backoff if it raises a conflict.
+
+    A conflict is raised by the Kubernetes API if the resourceVersion of an
+    object was unexpectedly incremented, e.g. if another process updated the
+    object between it being read and patched. The function should therefore
+    read, modify and patch the object each time it is called.
+
+    Args:
+        func (callable): The function to call.
+        steps (int): The maximum number of times to call the function.
+        base (float): The minimum number of seconds to back off after a conflict.
+        cap (float): The maximum number of seconds to back off.
+
+    Returns:
+        The return value of `func`.
+
+    Raises:
+        ApiException: if `func` raised a conflict on every attempt, or if it
+            raised an ApiException other than a conflict.
+    """
+    jitter = DecorrelatedJitter(base, cap)
+    for step in range(steps):
+        try:
+            return func()
+        except ApiException as err:
+            if err.status != ERR_CONFLICT or step == steps - 1:
+                raise
+            backoff = jitter.next_backoff()
+            LOGGER.warning("Conflict on attempt %s; retrying in %.2fs", step + 1, backoff)
+            time.sleep(backoff)
+    return None
@@ -1,6 +1,6 @@
 # MIT License
 #
-# (C) Copyright 2022-2023 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2022-2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -22,7 +22,7 @@
 #
 
 """
-Contains a utility function for merging two dictionaries together.
+Contains utility functions for merging two dictionaries together.
 """
 
 from copy import deepcopy
@@ -111,8 +111,8 @@ def _merge_input_with_existing(input_key, input_value, dict_to_update):
         dict_to_update[input_key] = input_value
         return
     if _values_are_dicts(dict_to_update[input_key], input_value):
-        # Merging two dicts, use merge_dict() recursively.
-        dict_to_update[input_key] = merge_dict(input_value, dict_to_update[input_key])
+        # Merging two dicts, merge into the existing dict recursively.
+        _merge_dict_into(input_value, dict_to_update[input_key])
         return
     if _values_are_lists(dict_to_update[input_key], input_value):
         # Merging two lists, use extend(). Do not duplicate items.
@@ -129,6 +129,51 @@ def _merge_input_with_existing(input_key, input_value, dict_to_update):
     dict_to_update[input_key] = input_value
 
 
+def _merge_dict_into(input_dict, dict_to_update):
+    """Merge the given input dict into an existing dictionary.
+
+    Helper for merge_dict and merge_dict_into.
+
+    Args:
+        input_dict: The dictionary to merge in.
+        dict_to_update: The dictionary in which to insert the new data.
+
+    Returns:
+        None. Modifies dict_to_update in place.
+    """
+    if _dict_contains_no_subdicts_or_lists(dict_to_update):
+        # Base case: can just use update().
+        dict_to_update.update(input_dict)
+        return
+
+    # Recursive case: iterate over keys/values to add and update dict_to_update.
+    for input_key, input_value in input_dict.items():
+        _merge_input_with_existing(input_key, input_value, dict_to_update)
+
+
+def merge_dict_into(input_dict, existing_dict):
+    """Merge two dictionaries, updating existing_dict in place.
+
+    Unlike merge_dict, existing_dict is not copied first, so this should only
+    be used when nothing else refers to existing_dict.
+
+    Args:
+        input_dict: The dictionary to merge in.
+        existing_dict: The dictionary to which the input_dict data should be
+            added.
+
+    Returns:
+        None. Modifies existing_dict in place.
+
+    Raises:
+        TypeError: if given arguments are not dict type.
+    """
+    if not _values_are_dicts(input_dict, existing_dict):
+        raise TypeError('Inputs to merge_dict_into must be dictionary type.')
+
+    _merge_dict_into(input_dict, existing_dict)
+
+
 def merge_dict(input_dict, existing_dict):
     """Merge two dictionaries and return the result.
 
@@ -146,16 +191,8 @@ def merge_dict(input_dict, existing_dict):
     if not _values_are_dicts(input_dict, existing_dict):
         raise TypeError('Inputs to merge_dict must be dictionary type.')
 
-    # Avoid updating existing_dict in place
+    # Avoid updating existing_dict in place; the copy is then merged into in place,
+    # so nested dicts are not copied again
     dict_to_return = deepcopy(existing_dict)
-
-    if _dict_contains_no_subdicts_or_lists(dict_to_return):
-        # Base case: can just use update().
-        dict_to_return.update(input_dict)
-        return dict_to_return
-
-    # Recursive case: iterate over keys/values to add and update existing_dict.
-    for input_key, input_value in input_dict.items():
-        _merge_input_with_existing(input_key, input_value, dict_to_return)
-
+    _merge_dict_into(input_dict, dict_to_return)
     return dict_to_return
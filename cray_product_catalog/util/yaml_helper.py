@@ -0,0 +1,90 @@
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+
+"""
+Contains utility functions for loading and dumping YAML, using the libyaml
+C implementation when it is available.
+"""
+
+from functools import partial
+
+import yaml
+
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+# The dumper options are bound once rather than passed on every call
+_dump = partial(yaml.dump, Dumper=SafeDumper, default_flow_style=False)
+_serialize = partial(yaml.serialize, Dumper=SafeDumper)
+
+
+def load_yaml(stream):
+    """Safely load YAML from a string or file.
+
+    Args:
+        stream (str or file): The YAML to load.
+
+    Returns:
+        The loaded data.
+    """
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def dump_yaml(data):
+    """Safely dump data to a YAML string in block style.
+
+    Args:
+        data: The data to dump.
+
+    Returns:
+        str: The YAML string.
+    """
+    return _dump(data)
+
+
+def compose_yaml(stream):
+    """Safely compose YAML from a string or file into a representation graph.
+
+    Unlike load_yaml, no Python objects are constructed for the data.
+
+    Args:
+        stream (str or file): The YAML to compose.
+
+    Returns:
+        yaml.Node: The root node, or None if the stream is empty.
+    """
+    return yaml.compose(stream, Loader=SafeLoader)
+
+
+def serialize_yaml(node):
+    """Serialize a representation graph to a YAML string.
+
+    Args:
+        node (yaml.Node): The root node, as returned by compose_yaml.
+
+    Returns:
+        str: The YAML string.
+    """
+    return _serialize(node)
@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2023-2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2023-2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -26,6 +26,8 @@
 Mock data for ConfigMapDataHandler
 """
 
+from types import MappingProxyType
+
 INITIAL_MAIN_CM_DATA = {
     'HFP-firmware': """
         22.10.2:
@@ -63,7 +65,8 @@ INITIAL_MAIN_CM_DATA = {
                 ssh_url: git@vcs.cmn.lemondrop.hpc.amslabs.hpecorp.net:cray/analytics-config-management.git"""
 }
 
-MAIN_CM_DATA_EXPECTED = {
+# The expected data is read-only, so that a test cannot change the data expected by the other tests
+MAIN_CM_DATA_EXPECTED = MappingProxyType({
     'HFP-firmware': """22.10.2: {}
 23.01.1: {}\n""",
     'analytics': """1.4.18:
@@ -80,11 +83,10 @@ MAIN_CM_DATA_EXPECTED = {
     import_branch: cray/analytics/1.4.20
     import_date: 2023-03-23 16:55:22.295666
     ssh_url: git@vcs.cmn.lemondrop.hpc.amslabs.hpecorp.net:cray/analytics-config-management.git\n"""
-}
+})
 
-PROD_CM_DATA_LIST_EXPECTED = [
-    {
-        'HFP-firmware': """22.10.2:
+PROD_CM_DATA_EXPECTED = MappingProxyType({
+    'HFP-firmware': """22.10.2:
   component_versions:
     docker:
     - name: cray-product-catalog-update
@@ -93,10 +95,8 @@ PROD_CM_DATA_LIST_EXPECTED = [
   component_versions:
     docker:
     - name: cray-product-catalog-update
-      version: 0.1.3\n"""
-    },
-    {
-        'analytics': """1.4.18:
+      version: 0.1.3\n""",
+    'analytics': """1.4.18:
   component_versions:
     s3:
     - bucket: boot-images
@@ -106,8 +106,7 @@ PROD_CM_DATA_LIST_EXPECTED = [
     s3:
     - bucket: boot-images
       key: Analytics/Cray-Analytics.x86_64-1.4.20.squashfs\n"""
-    }
-]
+})
 
 
 class MockYaml:
@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2023-2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2023-2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -26,25 +26,46 @@
 Tests for validating ConfigMapDataHandler
 """
 
+from types import SimpleNamespace
 import unittest
-from unittest.mock import patch, call, Mock
-from typing import Dict, List
+from unittest.mock import DEFAULT, patch, call, Mock
+from typing import Dict
 
 from cray_product_catalog.migration.main import main
-from cray_product_catalog.migration.config_map_data_handler import ConfigMapDataHandler
+from cray_product_catalog.migration.config_map_data_handler import ConfigMapDataHandler, _split_product_yaml
+from cray_product_catalog.migration.kube_apis import KubernetesApi
+from cray_product_catalog.util.yaml_helper import compose_yaml, load_yaml
 from cray_product_catalog.constants import (
     PRODUCT_CATALOG_CONFIG_MAP_NAME, PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-    PRODUCT_CATALOG_CONFIG_MAP_LABEL
+    PRODUCT_CATALOG_CONFIG_MAP_LABEL, PRODUCT_CATALOG_CONFIG_MAP_LABEL_KEY, PRODUCT_CONFIG_MAP_LABEL
 )
 from cray_product_catalog.migration import CONFIG_MAP_TEMP
 from tests.migration.migration_mock import (
-    MAIN_CM_DATA_EXPECTED, PROD_CM_DATA_LIST_EXPECTED, INITIAL_MAIN_CM_DATA, MockYaml
+    MAIN_CM_DATA_EXPECTED, PROD_CM_DATA_EXPECTED, INITIAL_MAIN_CM_DATA, MockYaml
 )
 
 
+# Only the migration's log messages are captured
+MIGRATION_LOGGER = 'cray_product_catalog.migration'
+
+# The ConfigMapDataHandler methods called by main
+HANDLER_METHODS = (
+    'migrate_config_map_data', 'create_product_config_maps', 'create_temp_config_map', 'rename_config_map'
+)
+
+# The names of the product ConfigMaps for PROD_CM_DATA_EXPECTED, and the calls creating them
+PRODUCT_CM_NAMES = ('cray-product-catalog-hfp-firmware', 'cray-product-catalog-analytics')
+CREATE_PRODUCT_CM_CALLS = [
+    call(PRODUCT_CM_NAMES[0], PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
+         {'HFP-firmware': PROD_CM_DATA_EXPECTED['HFP-firmware']}, PRODUCT_CONFIG_MAP_LABEL),
+    call(PRODUCT_CM_NAMES[1], PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
+         {'analytics': PROD_CM_DATA_EXPECTED['analytics']}, PRODUCT_CONFIG_MAP_LABEL),
+]
+
+
 def mock_split_catalog_data():
     """Mocking function to return custom data"""
-    return MAIN_CM_DATA_EXPECTED, PROD_CM_DATA_LIST_EXPECTED
+    return MAIN_CM_DATA_EXPECTED, PROD_CM_DATA_EXPECTED
 
 
 class TestConfigMapDataHandler(unittest.TestCase):
@@ -55,129 +76,176 @@ class TestConfigMapDataHandler(unittest.TestCase):
         self.mock_load_k8s_mig = patch('cray_product_catalog.migration.kube_apis.load_k8s').start()
         self.mock_corev1api_mig = patch('cray_product_catalog.migration.kube_apis.client.CoreV1Api').start()
         self.mock_ApiClient_mig = patch('cray_product_catalog.migration.kube_apis.ApiClient').start()
+        # build the shared API client from the mocks above
+        patch('cray_product_catalog.migration.kube_apis._SHARED_API', None).start()
         self.mock_client_mig = patch('cray_product_catalog.migration.kube_apis.client').start()
 
-        self.mock_k8api_read = patch(
-            'cray_product_catalog.migration.config_map_data_handler.KubernetesApi.read_config_map').start()
-        self.mock_k8api_create = patch(
-            'cray_product_catalog.migration.config_map_data_handler.KubernetesApi.create_config_map').start()
-        self.mock_k8api_delete = patch(
-            'cray_product_catalog.migration.config_map_data_handler.KubernetesApi.delete_config_map').start()
+        self.mock_k8api_read = patch.object(KubernetesApi, 'read_config_map').start()
+        self.mock_k8api_create = patch.object(KubernetesApi, 'create_config_map').start()
+        self.mock_k8api_delete = patch.object(KubernetesApi, 'delete_config_map').start()
+        self.mock_k8api_apply = patch.object(KubernetesApi, 'apply_config_map').start()
+        self.mock_k8api_read_labels = patch.object(KubernetesApi, 'read_config_map_labels').start()
+        self.mock_k8api_read_labels.return_value = {}
 
     def tearDown(self) -> None:
         patch.stopall()
 
+    def patch_handler_methods(self):
+        """Patch the ConfigMapDataHandler methods called by main."""
+        mocks = patch.multiple(ConfigMapDataHandler, **{method: DEFAULT for method in HANDLER_METHODS}).start()
+        self.mock_migrate_config_map = mocks['migrate_config_map_data']
+        self.mock_create_prod_cms = mocks['create_product_config_maps']
+        self.mock_create_temp_cm = mocks['create_temp_config_map']
+        self.mock_rename_cm = mocks['rename_config_map']
+
     def test_migrate_config_map_data(self):
         """ Validating the migration of data into multiple product ConfigMaps data """
 
         main_cm_data: Dict
-        prod_cm_data_list: List
+        prod_cm_data: Dict
         cmdh = ConfigMapDataHandler()
-        main_cm_data, prod_cm_data_list = cmdh.migrate_config_map_data(INITIAL_MAIN_CM_DATA)
+        main_cm_data, prod_cm_data = cmdh.migrate_config_map_data(dict(INITIAL_MAIN_CM_DATA))
 
         self.assertEqual(main_cm_data, MAIN_CM_DATA_EXPECTED)
-        self.assertEqual(prod_cm_data_list, PROD_CM_DATA_LIST_EXPECTED)
+        self.assertEqual(prod_cm_data, PROD_CM_DATA_EXPECTED)
+
+    def test_migrate_config_map_data_retry(self):
+        """ Validating product data is not split again when the same data is migrated again """
+
+        _split_product_yaml.cache_clear()
+        cmdh = ConfigMapDataHandler()
+        with patch('cray_product_catalog.migration.config_map_data_handler.compose_yaml',
+                   wraps=compose_yaml) as mock_compose_yaml, \
+                patch('cray_product_catalog.migration.config_map_data_handler.load_yaml',
+                      wraps=load_yaml) as mock_load_yaml:
+            first_result = cmdh.migrate_config_map_data(dict(INITIAL_MAIN_CM_DATA))
+            second_result = cmdh.migrate_config_map_data(dict(INITIAL_MAIN_CM_DATA))
+
+        self.assertEqual(first_result, second_result)
+        self.assertEqual(mock_compose_yaml.call_count, len(INITIAL_MAIN_CM_DATA))
+        # The data is split without being loaded into Python objects
+        mock_load_yaml.assert_not_called()
+
+    def test_migrate_config_map_data_no_component_versions(self):
+        """ Validating product data without `component_versions` is left unchanged without being parsed """
+
+        product_yaml = "1.0.0:\n    configuration:\n        commit: abc\n"
+        cmdh = ConfigMapDataHandler()
+        with patch('cray_product_catalog.migration.config_map_data_handler.compose_yaml') as mock_compose_yaml:
+            main_cm_data, prod_cm_data = cmdh.migrate_config_map_data({'sat': product_yaml})
+
+        self.assertEqual(main_cm_data, {'sat': product_yaml})
+        self.assertEqual(prod_cm_data, {})
+        mock_compose_yaml.assert_not_called()
+
+    def test_split_product_yaml_nothing_to_split(self):
+        """ Validating product data which only mentions `component_versions` in a value is not serialized again """
+
+        product_yaml = "1.0.0:\n    configuration:\n        commit: component_versions\n"
+        with patch('cray_product_catalog.migration.config_map_data_handler.serialize_yaml') as mock_serialize_yaml:
+            self.assertEqual(_split_product_yaml('sat', product_yaml), (product_yaml, None))
+        mock_serialize_yaml.assert_not_called()
+
+    def test_split_product_yaml_merge_key(self):
+        """ Validating product data using merge keys is loaded and split """
+
+        product_yaml = (
+            "1.0.0: &base\n"
+            "  component_versions:\n"
+            "    docker: []\n"
+            "  configuration:\n"
+            "    commit: abc\n"
+            "1.0.1:\n"
+            "  <<: *base\n"
+        )
+        main_yaml, product_versions_yaml = _split_product_yaml('sat', product_yaml)
+
+        self.assertEqual(load_yaml(main_yaml), {
+            '1.0.0': {'configuration': {'commit': 'abc'}},
+            '1.0.1': {'configuration': {'commit': 'abc'}},
+        })
+        self.assertEqual(load_yaml(product_versions_yaml), {
+            '1.0.0': {'component_versions': {'docker': []}},
+            '1.0.1': {'component_versions': {'docker': []}},
+        })
 
     def test_create_product_config_maps(self):
         """ Validating product ConfigMaps are created """
 
         # mock some additional functions
-        self.mock_v1_object_Meta_mig = patch('cray_product_catalog.migration.kube_apis.V1ObjectMeta').start()
+        self.mock_k8api_create.return_value = True
 
-        with self.assertLogs() as captured:
+        with self.assertLogs(MIGRATION_LOGGER) as captured:
             # call method under test
             cmdh = ConfigMapDataHandler()
-            cmdh.create_product_config_maps(PROD_CM_DATA_LIST_EXPECTED)
+            self.assertTrue(cmdh.create_product_config_maps(PROD_CM_DATA_EXPECTED))
 
-            dummy_prod_cm_names = ['cray-product-catalog-hfp-firmware', 'cray-product-catalog-analytics']
+            # Create ConfigMap called twice; the ConfigMaps are created concurrently so the order is not fixed
+            self.mock_k8api_create.assert_has_calls(calls=CREATE_PRODUCT_CM_CALLS, any_order=True)
 
-            self.mock_k8api_create.assert_has_calls(calls=[  # Create ConfigMap called twice
-                call(
-                    dummy_prod_cm_names[0], PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-                    PROD_CM_DATA_LIST_EXPECTED[0], PRODUCT_CATALOG_CONFIG_MAP_LABEL), call().__bool__(),
-                call(
-                    dummy_prod_cm_names[1], PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-                    PROD_CM_DATA_LIST_EXPECTED[1], PRODUCT_CATALOG_CONFIG_MAP_LABEL), call().__bool__(),
-            ]
-            )
-
-            # Verify the exact log message
-            self.assertEqual(
-                captured.records[0].getMessage(),
-                f"Created product ConfigMap {PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE}/{dummy_prod_cm_names[0]}")
-
-            self.assertEqual(
-                captured.records[1].getMessage(),
-                f"Created product ConfigMap {PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE}/{dummy_prod_cm_names[1]}")
+            # Verify the exact log messages
+            self.assertCountEqual(
+                [record.getMessage() for record in captured.records],
+                [f"Created product ConfigMap {PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE}/{PRODUCT_CM_NAMES[0]}",
+                 f"Created product ConfigMap {PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE}/{PRODUCT_CM_NAMES[1]}"])
 
     def test_create_second_product_config_map_failed(self):
         """ Validating scenario where creation of second product ConfigMap failed """
 
-        # mock some additional functions
-        self.mock_v1_object_Meta_mig = patch('cray_product_catalog.migration.kube_apis.V1ObjectMeta').start()
-
-        with self.assertLogs() as captured:
-            self.mock_k8api_create.side_effect = [True, False]
+        with self.assertLogs(MIGRATION_LOGGER) as captured:
+            self.mock_k8api_create.side_effect = lambda name, *args: name == PRODUCT_CM_NAMES[0]
 
             # call method under test
             cmdh = ConfigMapDataHandler()
-            cmdh.create_product_config_maps(PROD_CM_DATA_LIST_EXPECTED)
-
-            dummy_prod_cm_names = ['cray-product-catalog-hfp-firmware', 'cray-product-catalog-analytics']
-
-            self.mock_k8api_create.assert_has_calls(calls=[  # Create ConfigMap called twice
-                call(
-                    dummy_prod_cm_names[0], PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-                    PROD_CM_DATA_LIST_EXPECTED[0], PRODUCT_CATALOG_CONFIG_MAP_LABEL),
-                call(
-                    dummy_prod_cm_names[1], PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-                    PROD_CM_DATA_LIST_EXPECTED[1], PRODUCT_CATALOG_CONFIG_MAP_LABEL),
-            ]
-            )
+            self.assertFalse(cmdh.create_product_config_maps(PROD_CM_DATA_EXPECTED))
 
-            # Verify the exact log message
-            self.assertEqual(
-                captured.records[0].getMessage(),
-                f"Created product ConfigMap {PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE}/{dummy_prod_cm_names[0]}")
+            # Create ConfigMap called twice
+            self.mock_k8api_create.assert_has_calls(calls=CREATE_PRODUCT_CM_CALLS, any_order=True)
 
-            self.assertEqual(
-                captured.records[1].getMessage(),
-                f"Failed to create product ConfigMap {PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE}/{dummy_prod_cm_names[1]}")
+            # Verify the exact log messages
+            self.assertCountEqual(
+                [record.getMessage() for record in captured.records],
+                [f"Created product ConfigMap {PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE}/{PRODUCT_CM_NAMES[0]}",
+                 f"Failed to create product ConfigMap {PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE}/{PRODUCT_CM_NAMES[1]}"])
 
     def test_create_first_product_config_map_failed(self):
         """ Validating scenario where creation of first product ConfigMap failed. """
 
-        # mock some additional functions
-        self.mock_v1_object_Meta_mig = patch('cray_product_catalog.migration.kube_apis.V1ObjectMeta').start()
-
-        with self.assertLogs() as captured:
-            self.mock_k8api_create.side_effect = [False, False]
+        with self.assertLogs(MIGRATION_LOGGER) as captured:
+            self.mock_k8api_create.side_effect = lambda name, *args: name != PRODUCT_CM_NAMES[0]
 
             # call method under test
             cmdh = ConfigMapDataHandler()
-            cmdh.create_product_config_maps(PROD_CM_DATA_LIST_EXPECTED)
+            self.assertFalse(cmdh.create_product_config_maps(PROD_CM_DATA_EXPECTED))
 
-            dummy_prod_cm_names = ['cray-product-catalog-hfp-firmware', 'cray-product-catalog-analytics']
+            # The second product ConfigMap is still created; it is deleted by the rollback
+            self.assertEqual(self.mock_k8api_create.call_count, 2)
 
-            self.mock_k8api_create.assert_called_once_with(
-                dummy_prod_cm_names[0], PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-                PROD_CM_DATA_LIST_EXPECTED[0], PRODUCT_CATALOG_CONFIG_MAP_LABEL
-            )
+            # Verify the exact log messages
+            self.assertCountEqual(
+                [record.getMessage() for record in captured.records],
+                [f"Failed to create product ConfigMap {PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE}/{PRODUCT_CM_NAMES[0]}",
+                 f"Created product ConfigMap {PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE}/{PRODUCT_CM_NAMES[1]}"])
 
-            # Verify the exact log message
-            self.assertEqual(len(captured.records), 1)
+    def test_delete_product_config_maps_invalid_name(self):
+        """ Validating that no ConfigMap is deleted for an invalid product name """
 
-            self.assertEqual(
-                captured.records[0].getMessage(),
-                f"Failed to create product ConfigMap {PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE}/{dummy_prod_cm_names[0]}")
+        self.mock_k8api_delete.return_value = True
+
+        with self.assertLogs(MIGRATION_LOGGER) as captured:
+            # call method under test
+            cmdh = ConfigMapDataHandler()
+            self.assertTrue(cmdh.delete_product_config_maps(['cos', 'Invalid!']))
+
+        self.mock_k8api_delete.assert_called_once_with(f"{PRODUCT_CATALOG_CONFIG_MAP_NAME}-cos",
+                                                       PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE)
+        self.assertEqual([record.getMessage() for record in captured.records],
+                         ["Not deleting ConfigMap for product 'Invalid!' because the product name is invalid"])
 
     def test_create_temp_config_map(self):
         """ Validating temp main ConfigMap is created """
 
-        # mock some additional functions
-        self.mock_v1_object_Meta_mig = patch('cray_product_catalog.migration.kube_apis.V1ObjectMeta').start()
-
-        with self.assertLogs(level='DEBUG') as captured:
+        with self.assertLogs(MIGRATION_LOGGER, level='DEBUG') as captured:
             # call method under test
             cmdh = ConfigMapDataHandler()
             cmdh.create_temp_config_map(MAIN_CM_DATA_EXPECTED)
@@ -196,10 +264,9 @@ class TestConfigMapDataHandler(unittest.TestCase):
         """ Validating temp main ConfigMap creation failed """
 
         # mock some additional functions
-        self.mock_v1_object_Meta_mig = patch('cray_product_catalog.migration.kube_apis.V1ObjectMeta').start()
         self.mock_k8api_create.return_value = False
 
-        with self.assertLogs() as captured:
+        with self.assertLogs(MIGRATION_LOGGER) as captured:
             # call method under test
             cmdh = ConfigMapDataHandler()
             cmdh.create_temp_config_map(MAIN_CM_DATA_EXPECTED)
@@ -215,34 +282,33 @@ class TestConfigMapDataHandler(unittest.TestCase):
                 f"Creating ConfigMap {PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE}/{CONFIG_MAP_TEMP} failed")
 
     def test_rename_config_map(self):
-        """ Validating product ConfigMaps are created """
+        """ Validating main ConfigMap is replaced with the temporary ConfigMap data """
 
-        with self.assertLogs(level="DEBUG") as captured:
+        with self.assertLogs(MIGRATION_LOGGER, level="DEBUG") as captured:
             # call method under test
+            self.mock_k8api_apply.return_value = True
             self.mock_k8api_delete.return_value = True
-            self.mock_k8api_read.return_value = Mock(data=MAIN_CM_DATA_EXPECTED)
+            self.mock_k8api_read.return_value = SimpleNamespace(data=MAIN_CM_DATA_EXPECTED)
 
             cmdh = ConfigMapDataHandler()
-            cmdh.rename_config_map(rename_from=CONFIG_MAP_TEMP,
-                                   rename_to=PRODUCT_CATALOG_CONFIG_MAP_NAME,
-                                   namespace=PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-                                   label=PRODUCT_CATALOG_CONFIG_MAP_LABEL)
-
-            self.mock_k8api_delete.assert_has_calls(calls=[  # Delete ConfigMap called twice
-                call(PRODUCT_CATALOG_CONFIG_MAP_NAME,
-                     PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE),
-                call(CONFIG_MAP_TEMP,
-                     PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE),
-            ]
-            )
+            self.assertTrue(cmdh.rename_config_map(rename_from=CONFIG_MAP_TEMP,
+                                                   rename_to=PRODUCT_CATALOG_CONFIG_MAP_NAME,
+                                                   namespace=PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
+                                                   label=PRODUCT_CATALOG_CONFIG_MAP_LABEL))
+
+            # The main ConfigMap is replaced in place rather than deleted
+            self.mock_k8api_delete.assert_called_once_with(CONFIG_MAP_TEMP,
+                                                           PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE)
 
             self.mock_k8api_read.assert_called_once_with(CONFIG_MAP_TEMP,
                                                          PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE)
 
-            self.mock_k8api_create.assert_called_once_with(PRODUCT_CATALOG_CONFIG_MAP_NAME,
-                                                           PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-                                                           MAIN_CM_DATA_EXPECTED,
-                                                           PRODUCT_CATALOG_CONFIG_MAP_LABEL)
+            self.mock_k8api_apply.assert_called_once_with(PRODUCT_CATALOG_CONFIG_MAP_NAME,
+                                                          PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
+                                                          MAIN_CM_DATA_EXPECTED,
+                                                          PRODUCT_CATALOG_CONFIG_MAP_LABEL,
+                                                          resource_version=None)
+            self.mock_k8api_create.assert_not_called()
 
             # Verify the exact log message
             self.assertEqual(
@@ -251,167 +317,86 @@ class TestConfigMapDataHandler(unittest.TestCase):
 
     def test_rename_config_map_failed_1(self):
         """ Validating rename ConfigMap failure scenario where:
-            deleting cray-product-catalog ConfigMap failed. """
+            reading cray-product-catalog-temp ConfigMap failed. """
 
-        with self.assertLogs() as captured:
-            self.mock_k8api_delete.side_effect = [False, False]
+        with self.assertLogs(MIGRATION_LOGGER) as captured:
+            self.mock_k8api_read.return_value = None
             # call method under test
             cmdh = ConfigMapDataHandler()
-            cmdh.rename_config_map(CONFIG_MAP_TEMP, PRODUCT_CATALOG_CONFIG_MAP_NAME,
-                                   PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-                                   PRODUCT_CATALOG_CONFIG_MAP_LABEL)
+            self.assertFalse(cmdh.rename_config_map(CONFIG_MAP_TEMP, PRODUCT_CATALOG_CONFIG_MAP_NAME,
+                                                    PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
+                                                    PRODUCT_CATALOG_CONFIG_MAP_LABEL))
 
-            self.mock_k8api_delete.assert_called_once_with(PRODUCT_CATALOG_CONFIG_MAP_NAME,
-                                                           PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE)
+            # Retries are left to the Kubernetes API client
+            self.mock_k8api_read.assert_called_once_with(CONFIG_MAP_TEMP, PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE)
+            self.mock_k8api_apply.assert_not_called()
+            self.mock_k8api_delete.assert_not_called()
 
             # Verify the exact log message
             self.assertEqual(
                 captured.records[0].getMessage(),
-                f"Failed to delete ConfigMap {PRODUCT_CATALOG_CONFIG_MAP_NAME}")
+                f"Failed to read ConfigMap {CONFIG_MAP_TEMP}")
 
     def test_rename_config_map_failed_2(self):
         """ Validating rename ConfigMap failure scenario where:
-            creating cray-product-catalog ConfigMap failed. """
+            replacing cray-product-catalog ConfigMap failed. """
 
-        with self.assertLogs(level="DEBUG") as captured:
-            self.mock_k8api_create.return_value = False
-            self.mock_k8api_read.return_value = Mock(data=MAIN_CM_DATA_EXPECTED)
+        with self.assertLogs(MIGRATION_LOGGER, level="DEBUG") as captured:
+            self.mock_k8api_apply.return_value = False
+            self.mock_k8api_read.return_value = SimpleNamespace(data=MAIN_CM_DATA_EXPECTED)
 
             # call method under test
             cmdh = ConfigMapDataHandler()
-            cmdh.rename_config_map(CONFIG_MAP_TEMP,
-                                   PRODUCT_CATALOG_CONFIG_MAP_NAME,
-                                   PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-                                   PRODUCT_CATALOG_CONFIG_MAP_LABEL)
-
-            self.mock_k8api_delete.assert_called_once_with(PRODUCT_CATALOG_CONFIG_MAP_NAME,
-                                                           PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE)
-            calls = [  # Delete ConfigMap called twice
-                call(
-                    PRODUCT_CATALOG_CONFIG_MAP_NAME,
-                    PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE),
-                call(
-                    CONFIG_MAP_TEMP,
-                    PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE),
-            ]
-            self.mock_k8api_create.assert_has_calls(calls=[
-                call(PRODUCT_CATALOG_CONFIG_MAP_NAME, PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-                     MAIN_CM_DATA_EXPECTED, PRODUCT_CATALOG_CONFIG_MAP_LABEL),
-                call(PRODUCT_CATALOG_CONFIG_MAP_NAME, PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-                     MAIN_CM_DATA_EXPECTED, PRODUCT_CATALOG_CONFIG_MAP_LABEL),
-                call(PRODUCT_CATALOG_CONFIG_MAP_NAME, PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-                     MAIN_CM_DATA_EXPECTED, PRODUCT_CATALOG_CONFIG_MAP_LABEL),
-                call(PRODUCT_CATALOG_CONFIG_MAP_NAME, PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-                     MAIN_CM_DATA_EXPECTED, PRODUCT_CATALOG_CONFIG_MAP_LABEL),
-                call(PRODUCT_CATALOG_CONFIG_MAP_NAME, PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-                     MAIN_CM_DATA_EXPECTED, PRODUCT_CATALOG_CONFIG_MAP_LABEL),
-                call(PRODUCT_CATALOG_CONFIG_MAP_NAME, PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-                     MAIN_CM_DATA_EXPECTED, PRODUCT_CATALOG_CONFIG_MAP_LABEL),
-                call(PRODUCT_CATALOG_CONFIG_MAP_NAME, PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-                     MAIN_CM_DATA_EXPECTED, PRODUCT_CATALOG_CONFIG_MAP_LABEL),
-                call(PRODUCT_CATALOG_CONFIG_MAP_NAME, PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-                     MAIN_CM_DATA_EXPECTED, PRODUCT_CATALOG_CONFIG_MAP_LABEL),
-                call(PRODUCT_CATALOG_CONFIG_MAP_NAME, PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-                     MAIN_CM_DATA_EXPECTED, PRODUCT_CATALOG_CONFIG_MAP_LABEL),
-                call(PRODUCT_CATALOG_CONFIG_MAP_NAME, PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-                     MAIN_CM_DATA_EXPECTED, PRODUCT_CATALOG_CONFIG_MAP_LABEL),
-
-            ])
+            self.assertFalse(cmdh.rename_config_map(CONFIG_MAP_TEMP,
+                                                    PRODUCT_CATALOG_CONFIG_MAP_NAME,
+                                                    PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
+                                                    PRODUCT_CATALOG_CONFIG_MAP_LABEL))
+
+            # The temporary ConfigMap is kept, as the main ConfigMap was never replaced
+            self.mock_k8api_delete.assert_not_called()
+            self.mock_k8api_apply.assert_called_once_with(PRODUCT_CATALOG_CONFIG_MAP_NAME,
+                                                          PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
+                                                          MAIN_CM_DATA_EXPECTED, PRODUCT_CATALOG_CONFIG_MAP_LABEL,
+                                                          resource_version=None)
 
             # Verify the exact log message
             self.assertEqual(
                 captured.records[0].getMessage(),
-                f"Failed to create ConfigMap {PRODUCT_CATALOG_CONFIG_MAP_NAME}, retrying..")
+                f"Failed to replace ConfigMap {PRODUCT_CATALOG_CONFIG_MAP_NAME}")
 
     def test_rename_config_map_failed_3(self):
         """ Validating rename ConfigMap failure scenario where:
-            first operation of deleting cray-product-catalog-temp ConfigMap failed but later passed. """
+            deleting cray-product-catalog-temp ConfigMap failed. """
 
-        with self.assertLogs(level="DEBUG") as captured:
-            self.mock_k8api_read.return_value = Mock(data=MAIN_CM_DATA_EXPECTED)
-            self.mock_k8api_delete.side_effect = [True, False, True]
+        with self.assertLogs(MIGRATION_LOGGER, level="DEBUG") as captured:
+            self.mock_k8api_apply.return_value = True
+            self.mock_k8api_read.return_value = SimpleNamespace(data=MAIN_CM_DATA_EXPECTED)
+            self.mock_k8api_delete.return_value = False
 
             # call method under test
             cmdh = ConfigMapDataHandler()
-            cmdh.rename_config_map(CONFIG_MAP_TEMP,
-                                   PRODUCT_CATALOG_CONFIG_MAP_NAME,
-                                   PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-                                   PRODUCT_CATALOG_CONFIG_MAP_LABEL)
-
-            self.mock_k8api_delete.assert_has_calls(calls=[   # Delete ConfigMap called twice
-                  call(
-                      PRODUCT_CATALOG_CONFIG_MAP_NAME,
-                      PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE),
-                  call(
-                      CONFIG_MAP_TEMP,
-                      PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE),
-                ])
-            self.mock_k8api_create.assert_called_once_with(PRODUCT_CATALOG_CONFIG_MAP_NAME,
-                                                           PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-                                                           MAIN_CM_DATA_EXPECTED, PRODUCT_CATALOG_CONFIG_MAP_LABEL)
+            self.assertTrue(cmdh.rename_config_map(CONFIG_MAP_TEMP,
+                                                   PRODUCT_CATALOG_CONFIG_MAP_NAME,
+                                                   PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
+                                                   PRODUCT_CATALOG_CONFIG_MAP_LABEL))
 
-            # Verify the exact log message
-            self.assertEqual(2, len(captured.records))
-            self.assertEqual(
-                        captured.records[0].getMessage(),
-                        f"Failed to delete ConfigMap {CONFIG_MAP_TEMP}, retrying..")
-            self.assertEqual(
-                        captured.records[1].getMessage(),
-                        "Renaming ConfigMap successful")
-
-    def test_rename_config_map_failed_4(self):
-        """ Validating rename ConfigMap failure scenario where:
-            everytime deleting cray-product-catalog-temp ConfigMap failed. """
-
-        with self.assertLogs(level="DEBUG") as captured:
-            self.mock_k8api_read.return_value = Mock(data=MAIN_CM_DATA_EXPECTED)
-            self.mock_k8api_delete.side_effect = [True, False, False, False, False, False, False, False,
-                                                  False, False, False, False]
-
-            # call method under test
-            cmdh = ConfigMapDataHandler()
-            cmdh.rename_config_map(CONFIG_MAP_TEMP,
-                                   PRODUCT_CATALOG_CONFIG_MAP_NAME,
-                                   PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-                                   PRODUCT_CATALOG_CONFIG_MAP_LABEL)
-
-            self.mock_k8api_delete.assert_has_calls(calls=[
-                  call(
-                      PRODUCT_CATALOG_CONFIG_MAP_NAME,
-                      PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE),
-                  call(
-                      CONFIG_MAP_TEMP,
-                      PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE),
-                ])
-            self.mock_k8api_create.assert_called_once_with(PRODUCT_CATALOG_CONFIG_MAP_NAME,
-                                                           PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
-                                                           MAIN_CM_DATA_EXPECTED, PRODUCT_CATALOG_CONFIG_MAP_LABEL)
+            self.mock_k8api_delete.assert_called_once_with(CONFIG_MAP_TEMP, PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE)
+            self.mock_k8api_apply.assert_called_once_with(PRODUCT_CATALOG_CONFIG_MAP_NAME,
+                                                          PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
+                                                          MAIN_CM_DATA_EXPECTED, PRODUCT_CATALOG_CONFIG_MAP_LABEL,
+                                                          resource_version=None)
 
             # Verify the exact log message
-            self.assertEqual(12, len(captured.records))
+            self.assertEqual(1, len(captured.records))
             self.assertEqual(
-                        captured.records[-2].getMessage(),
-                        f"Failed to delete ConfigMap {CONFIG_MAP_TEMP}, retrying..")
-            self.assertEqual(
-                        captured.records[-1].getMessage(),
+                        captured.records[0].getMessage(),
                         f"Failed to delete ConfigMap {CONFIG_MAP_TEMP}, but migration is successful")
 
     def test_main_for_successful_migration(self):
         """Validating that migration is successful"""
-        self.mock_migrate_config_map = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.migrate_config_map_data'
-        ).start()
-        self.mock_create_prod_cms = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.create_product_config_maps'
-        ).start()
-        self.mock_create_temp_cm = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.create_temp_config_map'
-        ).start()
-        self.mock_rename_cm = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.rename_config_map'
-        ).start()
+        self.patch_handler_methods()
 
-        with self.assertLogs(level="DEBUG") as captured:
+        with self.assertLogs(MIGRATION_LOGGER, level="DEBUG") as captured:
             self.mock_k8api_read.return_value = Mock(data=MAIN_CM_DATA_EXPECTED)
             self.mock_migrate_config_map.return_value = mock_split_catalog_data()
             self.mock_create_prod_cms.return_value = True
@@ -425,256 +410,186 @@ class TestConfigMapDataHandler(unittest.TestCase):
                         captured.records[-1].getMessage(),
                         "Migration successful")
 
-    def test_main_failed_1(self):
-        """Validating that migration failed as renaming failed"""
+        # Only the labels are read to check whether it is migrated, and the data is read once
+        self.mock_k8api_read_labels.assert_called_once_with(PRODUCT_CATALOG_CONFIG_MAP_NAME,
+                                                            PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE)
+        self.mock_k8api_read.assert_called_once_with(PRODUCT_CATALOG_CONFIG_MAP_NAME,
+                                                     PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE)
+        self.mock_rename_cm.assert_called_once()
 
-        self.mock_migrate_config_map = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.migrate_config_map_data'
-        ).start()
-        self.mock_create_prod_cms = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.create_product_config_maps'
-        ).start()
-        self.mock_create_temp_cm = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.create_temp_config_map'
-        ).start()
-        self.mock_rename_cm = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.rename_config_map'
-        ).start()
+    def test_main_already_migrated(self):
+        """Validating that an already migrated ConfigMap is not migrated again"""
+        self.patch_handler_methods()
 
-        with self.assertRaises(SystemExit) as captured:
-            self.mock_k8api_read.return_value = Mock(data=MAIN_CM_DATA_EXPECTED)
-            self.mock_migrate_config_map.return_value = mock_split_catalog_data()
-            self.mock_create_prod_cms.return_value = True
-            self.mock_create_temp_cm.return_value = True
-            self.mock_rename_cm.return_value = False
+        with self.assertLogs(MIGRATION_LOGGER) as captured:
+            self.mock_k8api_read_labels.return_value = {
+                PRODUCT_CATALOG_CONFIG_MAP_LABEL_KEY: PRODUCT_CATALOG_CONFIG_MAP_NAME
+            }
 
             # Call method under test
             main()
 
-            self.assertTrue(
-              "Renaming cray-product-catalog-temp to cray-product-catalog ConfigMap failed, "
-              "calling rollback handler..." in captured.exception
-            )
-
-            self.assertTrue(
-              "Rollback successful" in captured.exception
-            )
+        self.assertEqual(captured.records[-1].getMessage(),
+                         f"Configmap {PRODUCT_CATALOG_CONFIG_MAP_NAME} already migrated")
+        self.mock_k8api_read.assert_not_called()
+        self.mock_migrate_config_map.assert_not_called()
+
+    def test_main_failed(self):
+        """Validating that migration fails, rolling back only once ConfigMaps may have been created"""
+
+        self.patch_handler_methods()
+        self.mock_rollback = patch(
+            'cray_product_catalog.migration.exit_handler.ExitHandler.rollback'
+        ).start()
+        handler_mocks = (self.mock_migrate_config_map, self.mock_create_prod_cms,
+                         self.mock_create_temp_cm, self.mock_rename_cm)
+
+        # (description, ConfigMap data read, migrate side effect, product ConfigMaps created,
+        #  temp ConfigMap created, renamed, expected log message, number of handler methods called)
+        cases = (
+            ("reading ConfigMap returned empty data", "", None, True, True, True,
+             "Error reading ConfigMap data, exiting migration process...", 0),
+            ("migrate_config_map failed with exception", MAIN_CM_DATA_EXPECTED, Exception, True, True, True,
+             "Failed to split ConfigMap Data, exiting migration process...", 1),
+            ("creating product ConfigMaps failed", MAIN_CM_DATA_EXPECTED, None, False, True, True,
+             "Calling rollback handler...", 3),
+            ("creating temp ConfigMap failed", MAIN_CM_DATA_EXPECTED, None, True, False, True,
+             "Calling rollback handler...", 3),
+            ("renaming failed", MAIN_CM_DATA_EXPECTED, None, True, True, False,
+             f"Renaming {CONFIG_MAP_TEMP} to {PRODUCT_CATALOG_CONFIG_MAP_NAME} ConfigMap failed, "
+             "calling rollback handler...", 4),
+        )
+        for (description, data, migrate_side_effect, prod_cms_created, temp_cm_created, renamed,
+             expected_message, handler_calls) in cases:
+            with self.subTest(description):
+                for mock in handler_mocks + (self.mock_rollback,):
+                    mock.reset_mock(return_value=True, side_effect=True)
+                self.mock_k8api_read.return_value = Mock(data=data)
+                self.mock_migrate_config_map.return_value = mock_split_catalog_data()
+                self.mock_migrate_config_map.side_effect = migrate_side_effect
+                self.mock_create_prod_cms.return_value = prod_cms_created
+                self.mock_create_temp_cm.return_value = temp_cm_created
+                self.mock_rename_cm.return_value = renamed
+
+                with self.assertLogs(MIGRATION_LOGGER) as captured, self.assertRaises(SystemExit) as exit_captured:
+                    # Call method under test
+                    main()
+
+                self.assertEqual(exit_captured.exception.code, 1)
+                self.assertIn(expected_message, [record.getMessage() for record in captured.records])
+                self.assertEqual([mock.called for mock in handler_mocks],
+                                 [True] * handler_calls + [False] * (len(handler_mocks) - handler_calls))
+                if self.mock_create_temp_cm.called:
+                    # The temp ConfigMap is created concurrently with the product ConfigMaps
+                    self.mock_create_temp_cm.assert_called_once_with(MAIN_CM_DATA_EXPECTED)
+                # The ConfigMaps are only rolled back once they may have been created
+                self.assertEqual(self.mock_rollback.called, handler_calls > 1)
 
-    def test_main_failed_2(self):
-        """Validating that migration failed as create temp cm failed"""
+    def test_main_failed_7(self):
+        """Validating that migration failed as initial and final resource version is different"""
 
-        self.mock_migrate_config_map = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.migrate_config_map_data'
-        ).start()
-        self.mock_create_prod_cms = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.create_product_config_maps'
-        ).start()
-        self.mock_create_temp_cm = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.create_temp_config_map'
-        ).start()
-        self.mock_rename_cm = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.rename_config_map'
+        self.patch_handler_methods()
+        self.mock_is_migrated = patch(
+            'cray_product_catalog.migration.main.is_migrated'
         ).start()
 
-        with self.assertRaises(SystemExit) as captured:
-            self.mock_k8api_read.return_value = Mock(data=MAIN_CM_DATA_EXPECTED)
-            self.mock_migrate_config_map.return_value = mock_split_catalog_data()
-            self.mock_create_prod_cms.return_value = True
-            self.mock_create_temp_cm.return_value = False
-
-            # Call method under test
-            main()
-
-            self.assertTrue(
-              "Rollback successful" in captured.exception
-            )
-
-            self.mock_rename_cm.assert_not_called()
-
-    def test_main_failed_3(self):
-        """Validating that migration failed as create product ConfigMaps failed"""
-
-        self.mock_migrate_config_map = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.migrate_config_map_data'
-        ).start()
-        self.mock_create_prod_cms = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.create_product_config_maps'
-        ).start()
-        self.mock_create_temp_cm = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.create_temp_config_map'
-        ).start()
-        self.mock_rename_cm = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.rename_config_map'
+        self.mock_rollback = patch(
+            'cray_product_catalog.migration.exit_handler.ExitHandler.rollback'
         ).start()
 
         with self.assertRaises(SystemExit) as captured:
-            self.mock_k8api_read.return_value = Mock(data=MAIN_CM_DATA_EXPECTED)
+            self.mock_k8api_read.side_effect = [MockYaml(1),
+                                                MockYaml(2),
+                                                MockYaml(3)]
             self.mock_migrate_config_map.return_value = mock_split_catalog_data()
-            self.mock_create_prod_cms.return_value = False
-
-            # Call method under test
-            main()
-
-            self.assertTrue(
-              "Rollback successful" in captured.exception
-            )
-
-            self.mock_create_temp_cm.assert_not_called()
-            self.mock_rename_cm.assert_not_called()
-
-    def test_main_failed_4(self):
-        """Validating that migration failed as migrate_config_map failed with exception"""
-
-        self.mock_migrate_config_map = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.migrate_config_map_data'
-        ).start()
-        self.mock_create_prod_cms = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.create_product_config_maps'
-        ).start()
-        self.mock_create_temp_cm = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.create_temp_config_map'
-        ).start()
-        self.mock_rename_cm = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.rename_config_map'
-        ).start()
-
-        with self.assertRaises(SystemExit) as captured:
-            self.mock_k8api_read.return_value = Mock(data=MAIN_CM_DATA_EXPECTED)
-            self.mock_migrate_config_map.return_value = Exception()
-
-            # Call method under test
-            main()
-
-            self.assertTrue(
-              "Failed to split ConfigMap Data, exiting migration process..." in captured.exception
-            )
-
-            self.mock_create_prod_cms.assert_not_called()
-            self.mock_create_temp_cm.assert_not_called()
-            self.mock_rename_cm.assert_not_called()
-
-    def test_main_failed_6(self):
-        """Validating that migration failed as read_config_map returned empty response / data."""
-
-        self.mock_migrate_config_map = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.migrate_config_map_data'
-        ).start()
-        self.mock_create_prod_cms = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.create_product_config_maps'
-        ).start()
-        self.mock_create_temp_cm = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.create_temp_config_map'
-        ).start()
-        self.mock_rename_cm = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.rename_config_map'
-        ).start()
-
-        with self.assertRaises(SystemExit) as captured:
-            self.mock_k8api_read.return_value = Mock(data="")
+            self.mock_create_prod_cms.return_value = True
+            self.mock_create_temp_cm.return_value = True
+            self.mock_rename_cm.return_value = False
+            self.mock_is_migrated.return_value = False
 
             # Call method under test
             main()
 
-            self.assertTrue(
-              "Error reading ConfigMap, exiting migration process..." in captured.exception
-            )
-
-            self.mock_migrate_config_map.assert_not_called()
-            self.mock_create_prod_cms.assert_not_called()
-            self.mock_create_temp_cm.assert_not_called()
-            self.mock_rename_cm.assert_not_called()
+        self.assertEqual(captured.exception.code, 1)
+        # Each attempt renames conditionally on the resource_version it read
+        self.assertEqual(
+            [kwargs['resource_version'] for _, kwargs in self.mock_rename_cm.call_args_list],
+            [1, 2]
+        )
+        # The ConfigMap read after the first attempt failed is reused by the second attempt
+        self.assertEqual(3, self.mock_k8api_read.call_count)
+        # The ConfigMaps are only rolled back once the last attempt fails
+        self.mock_rollback.assert_called_once_with()
 
-    def test_main_failed_7(self):
-        """Validating that migration failed as initial and final resource version is different"""
+    def test_main_failed_8(self):
+        """Validating that migration is successful in second attempt as initial and final resource
+           version is different in first attempt"""
 
-        self.mock_migrate_config_map = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.migrate_config_map_data'
-        ).start()
-        self.mock_create_prod_cms = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.create_product_config_maps'
-        ).start()
-        self.mock_create_temp_cm = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.create_temp_config_map'
-        ).start()
-        self.mock_rename_cm = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.rename_config_map'
-        ).start()
+        self.patch_handler_methods()
         self.mock_is_migrated = patch(
             'cray_product_catalog.migration.main.is_migrated'
         ).start()
 
-        with self.assertRaises(SystemExit) as captured:
+        self.mock_rollback = patch(
+            'cray_product_catalog.migration.exit_handler.ExitHandler.rollback'
+        ).start()
+
+        with self.assertLogs(MIGRATION_LOGGER, level="DEBUG") as captured:
             self.mock_k8api_read.side_effect = [MockYaml(1),
-                                                MockYaml(2),
-                                                MockYaml(1),
                                                 MockYaml(2)]
             self.mock_migrate_config_map.return_value = mock_split_catalog_data()
             self.mock_create_prod_cms.return_value = True
             self.mock_create_temp_cm.return_value = True
+            self.mock_rename_cm.side_effect = [False, True]
             self.mock_is_migrated.return_value = False
 
             # Call method under test
             main()
 
-            self.assertTrue(
-              "Re-trying migration process..." in captured.exception
-            )
+        # The ConfigMap is only read again after the conditional rename failed
+        self.assertEqual(2, self.mock_k8api_read.call_count)
+        self.mock_rename_cm.assert_called_with(CONFIG_MAP_TEMP, PRODUCT_CATALOG_CONFIG_MAP_NAME,
+                                               PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE,
+                                               PRODUCT_CATALOG_CONFIG_MAP_LABEL, resource_version=2)
 
-            self.assertTrue(
-              "Rollback successful" in captured.exception
-            )
+        # The ConfigMaps created by the first attempt are replaced rather than rolled back
+        self.mock_rollback.assert_not_called()
+        self.assertEqual(2, self.mock_create_prod_cms.call_count)
+        self.mock_k8api_delete.assert_not_called()
 
-            self.assertTrue(
-                f"ConfigMap {PRODUCT_CATALOG_CONFIG_MAP_NAME} is modified, exiting migration process..."
-            )
-            self.mock_rename_cm.assert_not_called()
+        # Verify the exact log messages
+        messages = [record.getMessage() for record in captured.records]
+        self.assertIn("Re-trying migration process...", messages)
+        self.assertEqual(messages[-1], "Migration successful")
 
-    def test_main_failed_8(self):
-        """Validating that migration is successful in second attempt as initial and final resource
-           version is different in first attempt"""
+    def test_main_retry_removed_product(self):
+        """Validating that the ConfigMap of a product removed before the second attempt is deleted"""
 
-        self.mock_migrate_config_map = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.migrate_config_map_data'
-        ).start()
-        self.mock_create_prod_cms = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.create_product_config_maps'
-        ).start()
-        self.mock_create_temp_cm = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.create_temp_config_map'
-        ).start()
-        self.mock_rename_cm = patch(
-            'cray_product_catalog.migration.config_map_data_handler.ConfigMapDataHandler.rename_config_map'
-        ).start()
+        self.patch_handler_methods()
         self.mock_is_migrated = patch(
             'cray_product_catalog.migration.main.is_migrated'
         ).start()
+        self.mock_rollback = patch(
+            'cray_product_catalog.migration.exit_handler.ExitHandler.rollback'
+        ).start()
 
-        with self.assertLogs(level="DEBUG") as captured:
-            # with self.assertRaises(SystemExit) as captured:
+        with self.assertLogs(MIGRATION_LOGGER, level="DEBUG") as captured:
             self.mock_k8api_read.side_effect = [MockYaml(1),
-                                                MockYaml(2),
-                                                MockYaml(1),
-                                                MockYaml(1)]
-            self.mock_migrate_config_map.return_value = mock_split_catalog_data()
+                                                MockYaml(2)]
+            self.mock_migrate_config_map.side_effect = [
+                (MAIN_CM_DATA_EXPECTED, {'sat': 'sat data', 'cos': 'cos data'}),
+                (MAIN_CM_DATA_EXPECTED, {'sat': 'sat data'}),
+            ]
             self.mock_create_prod_cms.return_value = True
             self.mock_create_temp_cm.return_value = True
-            self.mock_rename_cm.return_value = True
+            self.mock_rename_cm.side_effect = [False, True]
             self.mock_is_migrated.return_value = False
+            self.mock_k8api_delete.return_value = True
 
             # Call method under test
             main()
-            # Verify the exact log message
-            self.assertEqual(10, len(captured.records))
-            self.assertEqual(
-                captured.records[3].getMessage(),
-                "Re-trying migration process..."
-            )
-            self.assertEqual(
-                captured.records[6].getMessage(),
-                "Rollback successful"
-            )
 
-            self.assertEqual(
-                captured.records[-1].getMessage(),
-                "Migration successful"
-            )
+        self.mock_rollback.assert_not_called()
+        self.mock_k8api_delete.assert_called_once_with(f"{PRODUCT_CATALOG_CONFIG_MAP_NAME}-cos",
+                                                       PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE)
+        self.assertEqual(captured.records[-1].getMessage(), "Migration successful")
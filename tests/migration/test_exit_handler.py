@@ -1,6 +1,6 @@
 # MIT License
 #
-# (C) Copyright 2023-2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2023-2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -27,7 +27,8 @@ import unittest
 from unittest.mock import patch, call
 
 from cray_product_catalog.migration.exit_handler import _is_product_config_map, ExitHandler
-from cray_product_catalog.constants import PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE
+from cray_product_catalog.constants import PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE, PRODUCT_CONFIG_MAP_LABEL_STR
+from cray_product_catalog.migration import CONFIG_MAP_TEMP
 
 
 class TestExitHandler(unittest.TestCase):
@@ -37,6 +38,8 @@ class TestExitHandler(unittest.TestCase):
         self.mock_load_k8s_mig = patch('cray_product_catalog.migration.kube_apis.load_k8s').start()
         self.mock_corev1api_mig = patch('cray_product_catalog.migration.kube_apis.client.CoreV1Api').start()
         self.mock_ApiClient_mig = patch('cray_product_catalog.migration.kube_apis.ApiClient').start()
+        # build the shared API client from the mocks above
+        patch('cray_product_catalog.migration.kube_apis._SHARED_API', None).start()
 
         self.mock_k8api_del = patch(
             'cray_product_catalog.migration.exit_handler.KubernetesApi.delete_config_map').start()
@@ -62,6 +65,8 @@ class TestExitHandler(unittest.TestCase):
         """Test cases for checking all invalid patterns of product ConfigMap"""
         base_str = "cray-product-catalog"
         invalid_patterns = (
+            None,
+            "",
             f"{base_str}",
             "90-lojp",
             "cos2.3.45.x86"
@@ -74,9 +79,9 @@ class TestExitHandler(unittest.TestCase):
         """Validating the scenario where one of the product ConfigMap is not deleted"""
 
         with self.assertLogs() as captured:
-            self.mock_k8api_del.side_effect = [True, False]  # delete is called two times
-
             dummy_products = ["cray-product-catalog-cos", "cray-product-catalog-sma"]
+            # delete is called two times and fails for the last product
+            self.mock_k8api_del.side_effect = lambda name, namespace: name != dummy_products[-1]
             self.mock_k8api_list.return_value = dummy_products
             eh = ExitHandler()
             eh.rollback()
@@ -97,13 +102,56 @@ class TestExitHandler(unittest.TestCase):
             # Verify the exact log message from last return
             self.assertEqual(captured.records[-1].getMessage(), "Rollback successful")
 
+            # the product ConfigMaps are selected by their label
+            self.mock_k8api_list.assert_called_once_with(label=PRODUCT_CONFIG_MAP_LABEL_STR,
+                                                         namespace=PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE)
+
             # three calls in sequence for complete flow
             self.mock_k8api_del.assert_has_calls(calls=[
+                call(
+                    name=CONFIG_MAP_TEMP,
+                    namespace=PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE),
                 call(
                     name=dummy_products[0],
                     namespace=PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE),
                 call(
                     name=dummy_products[1],
                     namespace=PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE),
-                ]
+                ], any_order=True  # the ConfigMaps are deleted concurrently
             )
+
+    def test_rollback_only_product_config_maps(self):
+        """Validating that rollback only deletes the temporary ConfigMap and product ConfigMaps"""
+
+        with self.assertLogs() as captured:
+            self.mock_k8api_del.return_value = True
+            # e.g. a ConfigMap of another catalog which has the product ConfigMap label
+            self.mock_k8api_list.return_value = ["cray-product-catalog-cos", "other-catalog-cos"]
+            eh = ExitHandler()
+            eh.rollback()
+            self.assertEqual(captured.records[-1].getMessage(), "Rollback successful")
+
+        self.mock_k8api_list.assert_called_once_with(label=PRODUCT_CONFIG_MAP_LABEL_STR,
+                                                     namespace=PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE)
+        self.assertCountEqual(self.mock_k8api_del.call_args_list, [
+            call(name=CONFIG_MAP_TEMP, namespace=PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE),
+            call(name="cray-product-catalog-cos", namespace=PRODUCT_CATALOG_CONFIG_MAP_NAMESPACE),
+        ])
+
+    def test_product_config_map_names_cached(self):
+        """Validating that product ConfigMaps are listed once per rollback"""
+        dummy_products = ["cray-product-catalog-cos", "cray-product-catalog-sma"]
+        self.mock_k8api_list.return_value = dummy_products
+        self.mock_k8api_del.return_value = False
+
+        eh = ExitHandler()
+        get_product_config_maps = getattr(eh, '_ExitHandler__get_all_created_product_config_maps')
+        self.assertEqual(get_product_config_maps(), dummy_products)
+        self.assertEqual(get_product_config_maps(), dummy_products)
+        self.mock_k8api_list.assert_called_once()
+
+        # the product ConfigMaps may be created again, so they are listed again by the next rollback
+        with self.assertLogs():
+            eh.rollback()
+            eh.rollback()
+        self.assertEqual(self.mock_k8api_list.call_count, 2)
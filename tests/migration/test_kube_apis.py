@@ -0,0 +1,197 @@
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+"""
+File contains unit test classes for validating the Kubernetes API wrapper.
+"""
+
+import json
+import unittest
+from unittest.mock import patch, Mock
+
+from kubernetes.client.rest import ApiException
+
+from cray_product_catalog.migration import CONNECTION_POOL_MAXSIZE, RETRY_COUNT
+from cray_product_catalog.migration.kube_apis import KubernetesApi, METADATA_ACCEPT, METADATA_LIST_ACCEPT
+
+
+class TestKubernetesApi(unittest.TestCase):
+    """unittest class for KubernetesApi"""
+
+    def setUp(self) -> None:
+        self.mock_load_k8s_mig = patch('cray_product_catalog.migration.kube_apis.load_k8s').start()
+        self.mock_corev1api_mig = patch('cray_product_catalog.migration.kube_apis.client.CoreV1Api').start()
+        self.mock_ApiClient_mig = patch('cray_product_catalog.migration.kube_apis.ApiClient').start()
+        # build the shared API client from the mocks above
+        patch('cray_product_catalog.migration.kube_apis._SHARED_API', None).start()
+        self.mock_call_api = self.mock_corev1api_mig.return_value.api_client.call_api
+
+    def tearDown(self) -> None:
+        patch.stopall()
+
+    def test_api_shared(self):
+        """Validating that the Kubernetes configuration is loaded and the client built only once"""
+        first, second = KubernetesApi(), KubernetesApi()
+
+        self.assertIs(first.api_instance, second.api_instance)
+        self.mock_load_k8s_mig.assert_called_once_with()
+        self.mock_ApiClient_mig.assert_called_once()
+        configuration = self.mock_ApiClient_mig.call_args[1]['configuration']
+        self.assertEqual(configuration.connection_pool_maxsize, CONNECTION_POOL_MAXSIZE)
+        self.assertEqual(configuration.retries.total, RETRY_COUNT)
+        self.mock_ApiClient_mig.return_value.set_default_header.assert_called_once_with('Accept-Encoding', 'gzip')
+        self.mock_corev1api_mig.assert_called_once_with(self.mock_ApiClient_mig.return_value)
+
+    def test_create_config_map_exists(self):
+        """Validating that a ConfigMap which already exists is replaced"""
+        api = self.mock_corev1api_mig.return_value
+        api.create_namespaced_config_map.side_effect = ApiException(status=409, reason='Conflict')
+
+        with self.assertLogs():
+            k8api = KubernetesApi()
+            self.assertTrue(k8api.create_config_map('cray-product-catalog-cos', 'services',
+                                                    {'cos': 'data'}, {'type': 'cray-product-catalog'}))
+
+        api.replace_namespaced_config_map.assert_called_once()
+        name, namespace, body = api.replace_namespaced_config_map.call_args[0]
+        self.assertEqual((name, namespace, body['data']), ('cray-product-catalog-cos', 'services', {'cos': 'data'}))
+        self.assertNotIn('resourceVersion', body['metadata'])
+
+    def test_apply_config_map_modified(self):
+        """Validating that a conditional replace of a modified ConfigMap fails and is not retried"""
+        api = self.mock_corev1api_mig.return_value
+        api.replace_namespaced_config_map.side_effect = ApiException(status=409, reason='Conflict')
+
+        with self.assertLogs():
+            k8api = KubernetesApi()
+            self.assertFalse(k8api.apply_config_map('cray-product-catalog', 'services', {'cos': 'data'},
+                                                    {'type': 'cray-product-catalog'}, resource_version='42'))
+
+        body = api.replace_namespaced_config_map.call_args[0][2]
+        self.assertEqual(body['metadata']['resourceVersion'], '42')
+        api.create_namespaced_config_map.assert_not_called()
+
+    def test_apply_config_map_missing(self):
+        """Validating that a conditional replace does not create a missing ConfigMap"""
+        api = self.mock_corev1api_mig.return_value
+        api.replace_namespaced_config_map.side_effect = ApiException(status=404, reason='Not Found')
+
+        with self.assertLogs():
+            k8api = KubernetesApi()
+            self.assertFalse(k8api.apply_config_map('cray-product-catalog', 'services', {'cos': 'data'},
+                                                    {'type': 'cray-product-catalog'}, resource_version='42'))
+
+        api.create_namespaced_config_map.assert_not_called()
+
+    def test_create_config_map_exists_then_deleted(self):
+        """Validating that a ConfigMap deleted after failing to create it is not created again"""
+        api = self.mock_corev1api_mig.return_value
+        api.create_namespaced_config_map.side_effect = ApiException(status=409, reason='Conflict')
+        api.replace_namespaced_config_map.side_effect = ApiException(status=404, reason='Not Found')
+
+        with self.assertLogs():
+            k8api = KubernetesApi()
+            self.assertFalse(k8api.create_config_map('cray-product-catalog-cos', 'services',
+                                                     {'cos': 'data'}, {'type': 'cray-product-catalog'}))
+
+        api.create_namespaced_config_map.assert_called_once()
+        api.replace_namespaced_config_map.assert_called_once()
+
+    def test_apply_config_map_missing_then_created(self):
+        """Validating that replacing a ConfigMap falls back to creating and replacing it only once each"""
+        api = self.mock_corev1api_mig.return_value
+        api.create_namespaced_config_map.side_effect = ApiException(status=409, reason='Conflict')
+        api.replace_namespaced_config_map.side_effect = ApiException(status=404, reason='Not Found')
+
+        with self.assertLogs():
+            k8api = KubernetesApi()
+            self.assertFalse(k8api.apply_config_map('cray-product-catalog-cos', 'services',
+                                                    {'cos': 'data'}, {'type': 'cray-product-catalog'}))
+
+        api.create_namespaced_config_map.assert_called_once()
+        self.assertEqual(api.replace_namespaced_config_map.call_count, 2)
+
+    def test_delete_config_map_empty_name(self):
+        """Validating that a ConfigMap with an empty name is not deleted"""
+        api = self.mock_corev1api_mig.return_value
+
+        with self.assertLogs():
+            k8api = KubernetesApi()
+            self.assertFalse(k8api.delete_config_map('', 'services'))
+
+        api.delete_namespaced_config_map.assert_not_called()
+
+    def test_list_config_map_names(self):
+        """Validating that only the names are read from the undeserialized metadata list response"""
+        self.mock_call_api.return_value = Mock(data=json.dumps({
+            'items': [
+                {'metadata': {'name': 'cray-product-catalog-cos'}},
+                {'metadata': {}},
+                {'metadata': {'name': 'cray-product-catalog-sat'}},
+            ]
+        }).encode())
+
+        k8api = KubernetesApi()
+        self.assertEqual(k8api.list_config_map_names('services', 'type=cray-product-catalog'),
+                         ['cray-product-catalog-cos', 'cray-product-catalog-sat'])
+        self.mock_call_api.assert_called_once()
+        path, method = self.mock_call_api.call_args[0]
+        self.assertEqual((path, method), ('/api/v1/namespaces/{namespace}/configmaps', 'GET'))
+        kwargs = self.mock_call_api.call_args[1]
+        self.assertEqual(kwargs['path_params'], {'namespace': 'services'})
+        self.assertEqual(kwargs['query_params'], [('labelSelector', 'type=cray-product-catalog')])
+        self.assertEqual(kwargs['header_params'], {'Accept': METADATA_LIST_ACCEPT})
+        self.assertFalse(kwargs['_preload_content'])
+
+    def test_read_config_map_labels(self):
+        """Validating that only the metadata of the ConfigMap is read for its labels"""
+        self.mock_call_api.return_value = Mock(data=json.dumps({
+            'metadata': {'name': 'cray-product-catalog', 'labels': {'type': 'cray-product-catalog'}}
+        }).encode())
+
+        k8api = KubernetesApi()
+        self.assertEqual(k8api.read_config_map_labels('cray-product-catalog', 'services'),
+                         {'type': 'cray-product-catalog'})
+        path, method = self.mock_call_api.call_args[0]
+        self.assertEqual((path, method), ('/api/v1/namespaces/{namespace}/configmaps/{name}', 'GET'))
+        kwargs = self.mock_call_api.call_args[1]
+        self.assertEqual(kwargs['path_params'], {'namespace': 'services', 'name': 'cray-product-catalog'})
+        self.assertEqual(kwargs['header_params'], {'Accept': METADATA_ACCEPT})
+
+    def test_read_config_map_labels_api_exception(self):
+        """Validating that no labels are returned when reading the ConfigMap fails"""
+        self.mock_call_api.side_effect = ApiException(status=404, reason='Not Found')
+
+        with self.assertLogs():
+            k8api = KubernetesApi()
+            self.assertIsNone(k8api.read_config_map_labels('cray-product-catalog', 'services'))
+
+    def test_list_config_map_names_api_exception(self):
+        """Validating that no names are returned when listing fails"""
+        self.mock_call_api.side_effect = ApiException(status=500, reason='Internal Server Error')
+
+        with self.assertLogs():
+            k8api = KubernetesApi()
+            self.assertEqual(k8api.list_config_map_names('services', 'type=cray-product-catalog'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
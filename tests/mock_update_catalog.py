@@ -1,6 +1,6 @@
 # MIT License
 #
-# (C) Copyright 2023-2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2023-2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -25,22 +25,17 @@
 Mock data for catalog_update unit tests
 """
 
-import os
-from unittest import mock
 import kubernetes.client.rest
 from tests.mocks import COS_VERSIONS, Name
 
-# Mocking environment variables before import so that:
-# 1. import (create_config_map, update_config_map and main) is successful
-# 2. Additionally they will be used in testcase to verify the tests.
-mock.patch.dict(
-    os.environ, {
-        'PRODUCT': 'sat',
-        'PRODUCT_VERSION': '1.0.0',
-        'YAML_CONTENT_STRING': 'Test data',
-        'CONFIG_MAP_NAMESPACE': 'myNamespace'
-    }
-).start()
+# Environment variables read by catalog_update.main; they are also used in
+# testcases to verify the tests.
+UPDATE_ENV = {
+    'PRODUCT': 'sat',
+    'PRODUCT_VERSION': '1.0.0',
+    'YAML_CONTENT_STRING': 'Test data',
+    'CONFIG_MAP_NAMESPACE': 'myNamespace'
+}
 
 UPDATE_DATA = {
     '2.0.0': {
@@ -101,7 +96,7 @@ class ApiInstance():
             raise ApiException()
         return Response()
 
-    def patch_namespaced_config_map(self, name, namespace, body='xxx'):
+    def patch_namespaced_config_map(self, name, namespace, body='xxx', field_manager=None):
         """
         Dummy function to handle the call in code; does nothing
         """
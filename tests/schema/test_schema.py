@@ -1,7 +1,7 @@
 #
 # MIT License
 #
-# (C) Copyright 2021-2023 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2021-2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -27,12 +27,14 @@ Tests for schema validation
 """
 
 import copy
+import pkgutil
 import unittest
+from unittest.mock import patch
 
 from jsonschema.exceptions import ValidationError
 import yaml
 
-from cray_product_catalog.schema.validate import validate
+from cray_product_catalog.schema.validate import get_validator, validate
 
 SAT_OLD_FORMAT = yaml.safe_load("""
     component_versions:
@@ -270,6 +272,17 @@ class TestSchemaValidation(unittest.TestCase):
         with self.assertRaises(ValidationError):
             validate(data_to_validate)
 
+    def test_validator_cached(self):
+        """Test the schema is only loaded once when validating more than once."""
+        get_validator.cache_clear()
+        with patch('cray_product_catalog.schema.validate.pkgutil.get_data',
+                   wraps=pkgutil.get_data) as mock_get_data:
+            validate(SAT_OLD_FORMAT)
+            validate(SAT_NEW_FORMAT)
+
+        mock_get_data.assert_called_once()
+        self.assertIs(get_validator(), get_validator())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,6 @@
 # MIT License
 #
-# (C) Copyright 2023-2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2023-2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -25,10 +25,14 @@ Deleting keys/product or a specific version of a product from ConfigMap
 """
 import unittest
 from unittest import mock
-from unittest.mock import patch, call
+from unittest.mock import Mock, patch, call
+
+from kubernetes.client.rest import ApiException
+
 from tests.mock_update_catalog import ApiInstance
 
-from cray_product_catalog.catalog_delete import ModifyConfigMapUtil
+from cray_product_catalog.catalog_delete import ModifyConfigMapUtil, modify_config_map
+from cray_product_catalog.util.yaml_helper import dump_yaml, load_yaml
 
 
 class TestModifyConfigMapUtil(unittest.TestCase):
@@ -48,15 +52,10 @@ class TestModifyConfigMapUtil(unittest.TestCase):
         self.modify_config_map_util.key = "key"
         self.modify_config_map_util.main_cm_fields = ["main_a", "main_b", "main_c"]
         self.modify_config_map_util.product_cm_fields = ["prod_1", "prod_2", "prod_3"]
-        self.mock_ApiClient = mock.patch('cray_product_catalog.catalog_delete.ApiClient').start()
-        self.mock_client = mock.patch('cray_product_catalog.catalog_delete.client').start()
-        self.mock_api_instance = mock.patch(
-                'cray_product_catalog.catalog_delete.client.CoreV1Api', return_value=ApiInstance(raise_exception=False)
+        self.mock_get_api = mock.patch(
+                'cray_product_catalog.catalog_delete.get_core_v1_api', return_value=ApiInstance(raise_exception=False)
         ).start()
-        self.mock_api_instance.return_value.count = 1
-        self.mock_read_config_map = mock.patch(
-            'cray_product_catalog.catalog_delete.client.CoreV1Api.read_namespaced_config_map'
-            ).start()
+        self.mock_get_api.return_value.count = 1
 
     def tearDown(self) -> None:
         patch.stopall()
@@ -88,6 +87,13 @@ class TestModifyConfigMapUtil(unittest.TestCase):
 
         del mcmu
 
+    def test_object_has_no_dict(self):
+        """Test that attributes are stored in slots rather than an instance dict"""
+        mcmu = ModifyConfigMapUtil()
+        self.assertFalse(hasattr(mcmu, '__dict__'))
+        with self.assertRaises(AttributeError):
+            setattr(mcmu, 'not_a_field', "1")
+
     def test_delete_from_both_config_map(self):
         """Test cases to assert delete calls into both main and product ConfigMap"""
         self.modify_config_map_util.key = None
@@ -150,3 +156,68 @@ class TestModifyConfigMapUtil(unittest.TestCase):
         self.modify_config_map_util.key = 909  # non string is invalid as well
         self.modify_config_map_util.modify()
         self.mock_modify_config_map.assert_not_called()
+
+
+class TestModifyConfigMap(unittest.TestCase):
+    """unittest class for removing content from a single ConfigMap"""
+
+    def setUp(self) -> None:
+        self.mock_api = mock.Mock()
+        self.mock_api.read_namespaced_config_map.return_value.data = {
+            'sat': '1.0.0:\n  configuration:\n    clone_url: url\n  images: {}\n'
+        }
+        patch('cray_product_catalog.catalog_delete.get_core_v1_api', return_value=self.mock_api).start()
+        self.mock_dump_yaml = patch('cray_product_catalog.catalog_delete.dump_yaml', wraps=dump_yaml).start()
+
+    def tearDown(self) -> None:
+        patch.stopall()
+
+    def test_key_already_removed(self):
+        """Test that nothing is dumped or patched if the key was already removed"""
+        modify_config_map('main_cm', 'ns', 'sat', '1.0.0', 'recipes')
+        self.mock_dump_yaml.assert_not_called()
+        self.mock_api.patch_namespaced_config_map.assert_not_called()
+
+    def test_version_already_removed(self):
+        """Test that nothing is dumped or patched if the version was already removed"""
+        modify_config_map('main_cm', 'ns', 'sat', '2.0.0')
+        self.mock_dump_yaml.assert_not_called()
+        self.mock_api.patch_namespaced_config_map.assert_not_called()
+
+    def test_empty_product(self):
+        """Test that nothing is dumped or patched if the product has no data"""
+        self.mock_api.read_namespaced_config_map.return_value.data = {'sat': ''}
+        modify_config_map('main_cm', 'ns', 'sat', '1.0.0')
+        self.mock_dump_yaml.assert_not_called()
+        self.mock_api.patch_namespaced_config_map.assert_not_called()
+
+    def test_remove_key(self):
+        """Test that only the product with the key removed is patched"""
+        modify_config_map('main_cm', 'ns', 'sat', '1.0.0', 'configuration')
+        self.mock_api.patch_namespaced_config_map.assert_called_once()
+        patch_data = self.mock_api.patch_namespaced_config_map.call_args[0][2]['data']
+        self.assertEqual(load_yaml(patch_data['sat']), {'1.0.0': {'images': {}}})
+
+    def test_remove_last_version(self):
+        """Test that the product is removed if its last version is removed"""
+        modify_config_map('main_cm', 'ns', 'sat', '1.0.0')
+        self.mock_dump_yaml.assert_not_called()
+        patch_data = self.mock_api.patch_namespaced_config_map.call_args[0][2]['data']
+        self.assertEqual(patch_data, {'sat': None})
+
+    def test_retry_on_conflict(self):
+        """Test that the ConfigMap is read and patched again if it was changed since it was read"""
+        self.mock_api.read_namespaced_config_map.side_effect = [
+            Mock(data={'sat': '1.0.0:\n  images: {}\n'}, metadata=Mock(resource_version='1')),
+            Mock(data={'sat': '1.0.0:\n  images: {}\n1.0.1: {}\n'}, metadata=Mock(resource_version='2')),
+        ]
+        self.mock_api.patch_namespaced_config_map.side_effect = [ApiException(status=409, reason='Conflict'), None]
+        with patch('cray_product_catalog.util.k8s.time.sleep'), self.assertLogs(level='WARNING'):
+            modify_config_map('main_cm', 'ns', 'sat', '1.0.0')
+
+        self.assertEqual(self.mock_api.read_namespaced_config_map.call_count, 2)
+        bodies = [args[2] for args, _ in self.mock_api.patch_namespaced_config_map.call_args_list]
+        self.assertEqual([body['metadata']['resourceVersion'] for body in bodies], ['1', '2'])
+        # the second patch only removes the version from the data read again
+        self.assertEqual([body['data'] for body in bodies],
+                         [{'sat': None}, {'sat': dump_yaml({'1.0.1': {}})}])
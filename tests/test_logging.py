@@ -0,0 +1,57 @@
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+
+"""
+Unit tests for the cray_product_catalog.logging module
+"""
+
+import logging
+import unittest
+from unittest.mock import patch
+
+from cray_product_catalog.logging import configure_logging
+
+
+class TestConfigureLogging(unittest.TestCase):
+    """Tests for configure_logging"""
+
+    def setUp(self):
+        """Set up a logger without handlers."""
+        self.logger = logging.getLogger('cray_product_catalog')
+        patch.object(self.logger, 'handlers', []).start()
+        patch.object(self.logger, 'level', logging.NOTSET).start()
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_configure_logging_once(self):
+        """Test that calling configure_logging again does not add another handler"""
+        configure_logging()
+        configure_logging()
+
+        self.assertEqual(len(self.logger.handlers), 1)
+        self.assertEqual(self.logger.level, logging.INFO)
+
+
+if __name__ == '__main__':
+    unittest.main()
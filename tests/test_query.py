@@ -1,6 +1,6 @@
 # MIT License
 #
-# (C) Copyright 2021-2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2021-2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -31,6 +31,7 @@ import unittest
 from unittest.mock import Mock, patch
 
 from kubernetes.config import ConfigException
+from yaml import safe_dump
 
 from cray_product_catalog.query import (
     ProductCatalog,
@@ -111,6 +112,28 @@ class TestProductCatalog(unittest.TestCase):
         ]
         self.assertEqual(expected_names_and_versions, actual_names_and_versions)
 
+    def test_create_product_catalog_validates_once(self):
+        """Test each product is validated only once when creating a ProductCatalog."""
+        self.mock_load_config_map_data = patch('cray_product_catalog.query.load_config_map_data').start()
+        self.mock_load_config_map_data.return_value = MOCK_PRODUCTS
+        with patch('cray_product_catalog.schema.validate.validate') as mock_validate:
+            product_catalog = self.create_and_assert_product_catalog()
+        self.assertEqual(mock_validate.call_count, len(MOCK_PRODUCTS))
+        self.assertEqual(product_catalog.products, MOCK_PRODUCTS)
+
+    def test_create_product_catalog_version_with_colon(self):
+        """Test creating a ProductCatalog with product versions that contain ':'."""
+        config_maps = []
+        for cm_name, versions in ((PRODUCT_CATALOG_CONFIG_MAP_NAME, {'1:2.0.0': {'configuration': {}}}),
+                                  (f'{PRODUCT_CATALOG_CONFIG_MAP_NAME}-sat', {'1:2.0.0': {'images': {}}})):
+            config_map = Mock(data={'sat': safe_dump(versions)})
+            config_map.metadata.name = cm_name
+            config_maps.append(config_map)
+        self.mock_k8s_api.list_namespaced_config_map.return_value = Mock(items=config_maps)
+        product_catalog = self.create_and_assert_product_catalog()
+        product = product_catalog.get_product('sat', '1:2.0.0')
+        self.assertEqual(product.data, {'configuration': {}, 'images': {}})
+
     def test_create_product_catalog_invalid_product_data(self):
         """Test creating a ProductCatalog when the product catalog contains invalid YAML."""
         self.mock_k8s_api.list_namespaced_config_map.return_value = Mock(items=[MockInvalidYaml()])
@@ -224,6 +247,31 @@ class TestProductCatalog(unittest.TestCase):
         expected_component_data = SAT_VERSIONS['2.0.1']
         self.assertEqual(expected_component_data, actual_matching_product.data)
 
+    def test_get_product_after_products_changed(self):
+        """Test getting a product after the products are reassigned or added to"""
+        self.mock_load_config_map_data = patch('cray_product_catalog.query.load_config_map_data').start()
+        self.mock_load_config_map_data.return_value = list(MOCK_PRODUCTS)
+        product_catalog = self.create_and_assert_product_catalog()
+        self.assertEqual(product_catalog.get_product('sat').version, '2.0.1')
+
+        product_catalog.products.append(InstalledProductVersion('sat', '2.0.2', SAT_VERSIONS['2.0.1']))
+        self.assertEqual(product_catalog.get_product('sat').version, '2.0.2')
+
+        product_catalog.products = [InstalledProductVersion('sat', '1.0.0', SAT_VERSIONS['2.0.0'])]
+        self.assertEqual(product_catalog.get_product('sat').version, '1.0.0')
+        with self.assertRaises(ProductCatalogError):
+            product_catalog.get_product('cos')
+
+    def test_get_latest_matching_product_invalid_version(self):
+        """Test versions which are not valid PEP 440 versions are older than valid versions"""
+        self.mock_load_config_map_data = patch('cray_product_catalog.query.load_config_map_data').start()
+        self.mock_load_config_map_data.return_value = [
+            InstalledProductVersion('sat', version, SAT_VERSIONS['2.0.0'])
+            for version in ('2.0.0', 'not-a-version', '2.0.1')
+        ]
+        product_catalog = self.create_and_assert_product_catalog()
+        self.assertEqual(product_catalog.get_product('sat').version, '2.0.1')
+
 
 class TestInstalledProductVersion(unittest.TestCase):
     """Tests for the InstalledProductVersion class."""
@@ -344,6 +392,13 @@ class TestInstalledProductVersion(unittest.TestCase):
         )
         self.assertEqual(product_with_no_loftsman_manifests.loftsman_manifests, [])
 
+    def test_is_valid_not_dict(self):
+        """Test product version data that is not a dictionary is invalid without validating it."""
+        with patch('cray_product_catalog.schema.validate.validate') as mock_validate:
+            for data in (None, [], 'cos'):
+                self.assertFalse(InstalledProductVersion('cos', '2.0.1', data).is_valid)
+        mock_validate.assert_not_called()
+
     def test_str(self):
         """Test the string representation of InstalledProductVersion."""
         expected_str = 'cos-2.0.1'
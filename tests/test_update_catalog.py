@@ -1,6 +1,6 @@
 # MIT License
 #
-# (C) Copyright 2023-2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2023-2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -26,13 +26,28 @@
 
 import unittest
 from unittest import mock
+from kubernetes.client.rest import ApiException as K8sApiException
 from tests.mock_update_catalog import (
-    UPDATE_DATA, ApiInstance, ApiException
+    UPDATE_DATA, UPDATE_ENV, ApiInstance, ApiException
 )
+from cray_product_catalog.util.merge_dict import merge_dict
+from cray_product_catalog.util.yaml_helper import dump_yaml, load_yaml
 from cray_product_catalog.catalog_update import (
     create_config_map,
+    validate_schema,
+    get_active_state,
     update_config_map,
-    main
+    main,
+    ERR_CONFLICT,
+    MAX_RETRIES,
+    UpdateConfig
+)
+from cray_product_catalog.constants import PRODUCT_CATALOG_CONFIG_MAP_NAME as MAIN_CONFIG_MAP
+from cray_product_catalog.constants import PRODUCT_CONFIG_MAP_LABEL
+
+# Matches the environment variables in UPDATE_ENV
+CONFIG = UpdateConfig(
+    product='sat', product_version='1.0.0', config_map_namespace='myNamespace', yaml_content_string='Test data'
 )
 
 
@@ -44,8 +59,12 @@ class TestCatalogUpdate(unittest.TestCase):
         """Set up mocks."""
         self.mock_v1configmap = mock.patch('cray_product_catalog.catalog_update.V1ConfigMap').start()
         self.mock_load_k8s = mock.patch('cray_product_catalog.catalog_update.load_k8s').start()
-        self.mock_ApiClient = mock.patch('cray_product_catalog.catalog_update.ApiClient').start()
-        self.mock_client = mock.patch('cray_product_catalog.catalog_update.client').start()
+        self.mock_get_api = mock.patch('cray_product_catalog.catalog_update.get_core_v1_api').start()
+        mock.patch.dict('os.environ', UPDATE_ENV).start()
+
+    def tearDown(self):
+        """Stop mocks."""
+        mock.patch.stopall()
 
     def test_create_config_map_success_log(self):
         """
@@ -62,6 +81,8 @@ class TestCatalogUpdate(unittest.TestCase):
 
             expected_log = "Created product ConfigMap " + namespace + "/" + name
             self.assertEqual(captured.records[0].getMessage(), expected_log)  # Verify the exact log message
+        # product ConfigMaps are created with the product ConfigMap label
+        self.assertEqual(self.mock_v1configmap.return_value.metadata.labels, PRODUCT_CONFIG_MAP_LABEL)
 
     def test_create_config_map_failure_exception(self):
         """
@@ -81,28 +102,66 @@ class TestCatalogUpdate(unittest.TestCase):
             expected_log = f"Error calling create_namespaced_config_map on ConfigMap {namespace}/{name}"
             self.assertEqual(captured.records[0].getMessage(), expected_log)  # Verify the exact log message
 
+    def test_config_from_env(self):
+        """
+        Verify the configuration is read from the environment variables
+        """
+        with mock.patch.dict('os.environ', {'SET_ACTIVE_VERSION': 'true', 'YAML_CONTENT': ' file.yaml '}):
+            config = UpdateConfig.from_env()
+        self.assertEqual(config, CONFIG._replace(set_active_version=True, yaml_content_file='file.yaml'))
+
+    def test_config_from_env_missing_product(self):
+        """
+        Verify reading the configuration exits if PRODUCT is not set
+        """
+        with mock.patch.dict('os.environ', {'PRODUCT': ''}):
+            with self.assertRaises(SystemExit):
+                UpdateConfig.from_env()
+
+    def test_validate_schema_invalid(self):
+        """
+        Verify validate_schema exits if the data does not match the schema
+        """
+        with self.assertLogs(level='ERROR'):
+            with self.assertRaises(SystemExit):
+                validate_schema({'component_versions': 'not a mapping'})
+
+    def test_get_active_state(self):
+        """
+        Verify get_active_state for the version being updated, which is 1.0.0
+        """
+        self.assertEqual(get_active_state({'1.0.0': {}, '0.9.0': {}}, '1.0.0'), (False, False))
+        self.assertEqual(get_active_state({'1.0.0': {'active': True}, '0.9.0': {}}, '1.0.0'), (True, True))
+        self.assertEqual(get_active_state({'1.0.0': {'active': True}, '0.9.0': {'active': True}}, '1.0.0'),
+                         (False, True))
+        self.assertEqual(get_active_state({'1.0.0': {'active': False}, '0.9.0': {'active': False}}, '1.0.0'),
+                         (False, True))
+
     def test_update_config_map_max_retries(self):
         """
-        Verify update_config_map exits after max retries if Kubernetes API raise exception.
+        Verify update_config_map exits after max retries if patching the ConfigMap always conflicts.
         """
         name = "cos"
         namespace = "product"
         self.mock_v1configmap.metadata = None
+        self.mock_v1_object_Meta = mock.patch('cray_product_catalog.catalog_update.V1ObjectMeta').start()
 
-        self.mock_read_config_map = mock.patch(
-            'cray_product_catalog.catalog_update.client.CoreV1Api.read_namespaced_config_map'
-            ).start().side_effect = ApiException()
+        api_instance = mock.Mock()
+        api_instance.read_namespaced_config_map.return_value.data = {}
+        api_instance.patch_namespaced_config_map.side_effect = K8sApiException(status=ERR_CONFLICT)
 
-        with self.assertRaises(SystemExit) as captured:
-            with mock.patch(
-                    'cray_product_catalog.catalog_update.random.randint', return_value=0
-            ):
-                # call method under test
-                update_config_map(UPDATE_DATA, name, namespace)
-                # Verify the exact log message
-                self.assertTrue(
-                    f"Exceeded number of attempts; Not updating ConfigMap {namespace}/{name}."
-                    in captured.exception)
+        self.mock_get_api.return_value = api_instance
+        with mock.patch('cray_product_catalog.util.k8s.time.sleep') as mock_sleep:
+            with self.assertLogs() as captured:
+                with self.assertRaises(SystemExit):
+                    # call method under test
+                    update_config_map(CONFIG, UPDATE_DATA, name, namespace)
+
+        self.assertEqual(api_instance.patch_namespaced_config_map.call_count, MAX_RETRIES)
+        self.assertEqual(mock_sleep.call_count, MAX_RETRIES - 1)
+        # Verify the exact log message
+        self.assertEqual(captured.records[-1].getMessage(),
+                         f"Exceeded number of attempts; Not updating ConfigMap {namespace}/{name}.")
 
     def test_update_config_map(self):
         """
@@ -114,19 +173,126 @@ class TestCatalogUpdate(unittest.TestCase):
 
         # mock some additional functions
         self.mock_create_config_map = mock.patch('cray_product_catalog.catalog_update.create_config_map').start()
+        # the created ConfigMap has no data
+        self.mock_create_config_map.return_value.data = None
         self.mock_v1_object_Meta = mock.patch('cray_product_catalog.catalog_update.V1ObjectMeta').start()
 
-        with mock.patch(
-                'cray_product_catalog.catalog_update.client.CoreV1Api', return_value=ApiInstance(raise_exception=True)
-        ):
-            with mock.patch(
-                    'cray_product_catalog.catalog_update.random.randint', return_value=0.5
-            ):
+        self.mock_get_api.return_value = ApiInstance(raise_exception=True)
+        # call method under test
+        update_config_map(CONFIG, data, name, namespace)
+
+        # verify if create-config_map is called. Couldn't verify it with arguments as one of the arg is object.
+        self.mock_create_config_map.assert_called()
+
+    def test_update_config_map_patches_only_product(self):
+        """
+        Verify update_config_map only sends the data for the product being updated
+        """
+        name = "cos"
+        namespace = "product"
+        self.mock_v1_object_Meta = mock.patch('cray_product_catalog.catalog_update.V1ObjectMeta').start()
+
+        api_instance = mock.Mock()
+        api_instance.read_namespaced_config_map.return_value.data = {'other-product': 'other-data'}
+        self.mock_get_api.return_value = api_instance
+        # call method under test
+        update_config_map(CONFIG, UPDATE_DATA, name, namespace)
+
+        api_instance.patch_namespaced_config_map.assert_called_once_with(
+            name, namespace, body=mock.ANY, field_manager='cray-product-catalog'
+        )
+        body = api_instance.patch_namespaced_config_map.call_args[1]['body']
+        self.assertEqual(list(body['data'].keys()), ['sat'])
+        self.assertEqual(body['metadata'], {
+            'name': name,
+            'resourceVersion': api_instance.read_namespaced_config_map.return_value.metadata.resource_version
+        })
+
+    def test_update_config_map_merges_once(self):
+        """
+        Verify update_config_map merges the data into an existing version only once
+        """
+        name = "cos"
+        namespace = "product"
+        self.mock_v1_object_Meta = mock.patch('cray_product_catalog.catalog_update.V1ObjectMeta').start()
+
+        api_instance = mock.Mock()
+        api_instance.read_namespaced_config_map.return_value.data = {'sat': '1.0.0:\n  foo: bar\n'}
+        self.mock_get_api.return_value = api_instance
+        with mock.patch('cray_product_catalog.catalog_update.merge_dict', wraps=merge_dict) as mock_merge_dict:
+            # call method under test
+            update_config_map(CONFIG, {'baz': 'qux'}, name, namespace)
+
+        mock_merge_dict.assert_called_once_with({'baz': 'qux'}, {'foo': 'bar'})
+        patch_data = api_instance.patch_namespaced_config_map.call_args[1]['body']['data']
+        self.assertEqual(load_yaml(patch_data['sat']), {'1.0.0': {'foo': 'bar', 'baz': 'qux'}})
+
+    def test_update_config_map_overwrite_does_not_modify_data(self):
+        """
+        Verify update_config_map does not modify the data when overwriting an existing version
+        """
+        name = "cos"
+        namespace = "product"
+        self.mock_v1_object_Meta = mock.patch('cray_product_catalog.catalog_update.V1ObjectMeta').start()
+
+        api_instance = mock.Mock()
+        api_instance.read_namespaced_config_map.return_value.data = {'sat': '1.0.0:\n  foo: bar\n'}
+        self.mock_get_api.return_value = api_instance
+        data = {'baz': 'qux'}
+        # call method under test
+        update_config_map(CONFIG._replace(update_overwrite=True, set_active_version=True), data, name, namespace)
+
+        self.assertEqual(data, {'baz': 'qux'})
+        patch_data = api_instance.patch_namespaced_config_map.call_args[1]['body']['data']
+        self.assertEqual(load_yaml(patch_data['sat']), {'1.0.0': {'baz': 'qux', 'active': True}})
+
+    def test_update_config_map_no_data(self):
+        """
+        Verify a product ConfigMap is not read or patched if there is no data to add
+        """
+        update_config_map(CONFIG, {}, "cray-product-catalog-sat", "product")
+        self.mock_get_api.assert_not_called()
+
+    def test_update_config_map_reuses_product_yaml(self):
+        """
+        Verify the updated product YAML is reused on retries which read the same product YAML
+        """
+        name = "cos"
+        namespace = "product"
+        self.mock_v1_object_Meta = mock.patch('cray_product_catalog.catalog_update.V1ObjectMeta').start()
+
+        api_instance = mock.Mock()
+        api_instance.read_namespaced_config_map.return_value.data = {'sat': '1.0.0:\n  foo: bar\n'}
+        api_instance.patch_namespaced_config_map.side_effect = [K8sApiException(status=ERR_CONFLICT), None]
+        self.mock_get_api.return_value = api_instance
+        with mock.patch('cray_product_catalog.util.k8s.time.sleep'), self.assertLogs(level='WARNING'):
+            with mock.patch('cray_product_catalog.catalog_update.dump_yaml', wraps=dump_yaml) as mock_dump_yaml:
                 # call method under test
-                update_config_map(data, name, namespace)
+                update_config_map(CONFIG, {'baz': 'qux'}, name, namespace)
+
+        self.assertEqual(api_instance.patch_namespaced_config_map.call_count, 2)
+        mock_dump_yaml.assert_called_once()
+
+    def test_update_config_map_waits_for_main_config_map(self):
+        """
+        Verify `wait_for_config_map` is called if the main ConfigMap does not exist yet
+        """
+        namespace = "product"
+        self.mock_wait_for_config_map = mock.patch(
+            'cray_product_catalog.catalog_update.wait_for_config_map'
+        ).start()
+        # the created ConfigMap has no data
+        self.mock_wait_for_config_map.return_value.data = None
+        self.mock_create_config_map = mock.patch('cray_product_catalog.catalog_update.create_config_map').start()
+        self.mock_v1_object_Meta = mock.patch('cray_product_catalog.catalog_update.V1ObjectMeta').start()
+        api_instance = ApiInstance(raise_exception=False)
 
-                # verify if create-config_map is called. Couldn't verify it with arguments as one of the arg is object.
-                self.mock_create_config_map.assert_called()
+        self.mock_get_api.return_value = api_instance
+        # call method under test
+        update_config_map(CONFIG, UPDATE_DATA, MAIN_CONFIG_MAP, namespace)
+
+        self.mock_wait_for_config_map.assert_called_once_with(api_instance, MAIN_CONFIG_MAP, namespace)
+        self.mock_create_config_map.assert_not_called()
 
     def test_main_valid_product_configmap(self):
         """
@@ -153,7 +319,30 @@ class TestCatalogUpdate(unittest.TestCase):
             expected_product_cm = 'cray-product-catalog-sat'
             # myNamespace is from CONFIG_MAP_NAMESPACE environment variable.
             expected_namespace = 'myNamespace'
-            self.mock_update_config_map.assert_called_with(prod_cm, expected_product_cm, expected_namespace)
+            # The ConfigMaps are updated concurrently, so the order of the calls is not fixed
+            self.mock_update_config_map.assert_has_calls([
+                mock.call(CONFIG, main_cm, MAIN_CONFIG_MAP, expected_namespace),
+                mock.call(CONFIG, prod_cm, expected_product_cm, expected_namespace),
+            ], any_order=True)
+
+    def test_main_update_failure_exits(self):
+        """
+        Verify `main` exits if updating one of the ConfigMaps fails
+        """
+        prod_cm = {"Some random text for product"}
+        main_cm = {"Some random text for main"}
+
+        self.mock_update_config_map = mock.patch(
+            'cray_product_catalog.catalog_update.update_config_map', side_effect=[None, SystemExit(1)]
+        ).start()
+
+        with mock.patch(
+                'cray_product_catalog.catalog_update.split_catalog_data', return_value=(main_cm, prod_cm)
+        ):
+            with self.assertRaises(SystemExit):
+                # call method under test
+                main()
+        self.assertEqual(self.mock_update_config_map.call_count, 2)
 
     def test_main_for_empty_product_configmap(self):
         """
@@ -1,6 +1,6 @@
 # MIT License
 #
-# (C) Copyright 2023-2024 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2023-2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -119,6 +119,12 @@ class TestCatalogDataHelper(unittest.TestCase):
         config_map = ""
         self.assertEqual(format_product_cm_name(config_map, product_name), "")
 
+    def test_format_product_name_max_length(self):
+        """Unit test case for product names at and just over the maximum length"""
+        config_map = "cm"
+        self.assertEqual(format_product_cm_name(config_map, "a" * 250), f"{config_map}-{'a' * 250}")
+        self.assertEqual(format_product_cm_name(config_map, "a" * 251), "")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,192 @@
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+
+"""
+Unit tests for the cray_product_catalog.util.k8s module
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from cray_product_catalog.util import k8s
+from cray_product_catalog.util.k8s import (
+    API_BACKOFF_MAX, DecorrelatedJitter, JitteredRetry, get_api_retry, get_core_v1_api, retry_on_conflict,
+    wait_for_config_map
+)
+
+
+class TestGetCoreV1Api(unittest.TestCase):
+    """Tests for get_core_v1_api"""
+
+    def setUp(self):
+        """Set up mocks."""
+        self.mock_api_client = patch('cray_product_catalog.util.k8s.ApiClient').start()
+        self.mock_core_v1_api = patch('cray_product_catalog.util.k8s.client.CoreV1Api').start()
+        patch('cray_product_catalog.util.k8s._API', None).start()
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_api_pool_is_not_smaller_than_default(self):
+        """Test that the connection pool is not made smaller than the kubernetes client default"""
+        with patch('cray_product_catalog.util.k8s.client.Configuration.get_default_copy') as mock_get_default_copy:
+            mock_get_default_copy.return_value.connection_pool_maxsize = k8s.API_CONNECTION_POOL_MAXSIZE * 2
+            get_core_v1_api()
+
+        configuration = self.mock_api_client.call_args[1]['configuration']
+        self.assertEqual(configuration.connection_pool_maxsize, k8s.API_CONNECTION_POOL_MAXSIZE * 2)
+
+    def test_api_is_shared(self):
+        """Test that the API client is only created once"""
+        first_api = get_core_v1_api()
+        second_api = get_core_v1_api()
+
+        self.assertIs(first_api, second_api)
+        self.assertIs(first_api, self.mock_core_v1_api.return_value)
+        self.mock_api_client.assert_called_once()
+        configuration = self.mock_api_client.call_args[1]['configuration']
+        self.assertEqual(configuration.connection_pool_maxsize,
+                         max(k8s.API_CONNECTION_POOL_MAXSIZE, client.Configuration().connection_pool_maxsize))
+        self.mock_core_v1_api.assert_called_once_with(self.mock_api_client.return_value)
+        self.assertEqual(configuration.retries.total, k8s.API_RETRIES)
+
+
+class TestWaitForConfigMap(unittest.TestCase):
+    """Tests for wait_for_config_map"""
+
+    def setUp(self):
+        """Set up mocks."""
+        self.mock_watch = patch('cray_product_catalog.util.k8s.watch.Watch').start().return_value
+        self.api_instance = Mock()
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_config_map_created(self):
+        """Test that the ConfigMap is returned as soon as it is added"""
+        config_map = Mock()
+        self.mock_watch.stream.return_value = iter([{'type': 'ADDED', 'object': config_map}])
+
+        self.assertEqual(wait_for_config_map(self.api_instance, 'name', 'namespace'), config_map)
+        self.mock_watch.stream.assert_called_once_with(
+            self.api_instance.list_namespaced_config_map, 'namespace',
+            field_selector='metadata.name=name', timeout_seconds=60
+        )
+        self.mock_watch.stop.assert_called_once_with()
+
+    def test_config_map_timeout(self):
+        """Test that None is returned if the ConfigMap is never created"""
+        self.mock_watch.stream.return_value = iter([])
+
+        with self.assertLogs(level='WARNING'):
+            self.assertIsNone(wait_for_config_map(self.api_instance, 'name', 'namespace', timeout=1))
+
+
+class TestGetApiRetry(unittest.TestCase):
+    """Tests for get_api_retry"""
+
+    def test_backoff_capped(self):
+        """Test that the backoff is jittered and capped, and kept by later retries"""
+        retry = get_api_retry(20)
+        for _ in range(15):
+            retry = retry.increment(method='GET', url='/', error=ConnectionError())
+        self.assertIsInstance(retry, JitteredRetry)
+        with patch('cray_product_catalog.util.k8s.random.uniform', side_effect=lambda low, high: high) as uniform:
+            self.assertEqual(retry.get_backoff_time(), API_BACKOFF_MAX)
+        uniform.assert_called_once_with(0, API_BACKOFF_MAX)
+
+    def test_first_retry_immediate(self):
+        """Test that the first retry does not back off"""
+        retry = get_api_retry(20).increment(method='GET', url='/', error=ConnectionError())
+        self.assertEqual(retry.get_backoff_time(), 0)
+
+
+class TestDecorrelatedJitter(unittest.TestCase):
+    """Tests for DecorrelatedJitter"""
+
+    def test_backoff_bounds(self):
+        """Test that each backoff is between the base and three times the previous backoff, up to the cap"""
+        jitter = DecorrelatedJitter(base=0.05, cap=2.0)
+        prev = 0.05
+        for _ in range(20):
+            backoff = jitter.next_backoff()
+            self.assertTrue(0.05 <= backoff <= min(2.0, prev * 3))
+            prev = backoff
+
+    def test_backoff_cap(self):
+        """Test that the backoff does not exceed the cap"""
+        jitter = DecorrelatedJitter(base=0.05, cap=2.0)
+        with patch('cray_product_catalog.util.k8s.random.uniform', side_effect=lambda low, high: high):
+            backoffs = [jitter.next_backoff() for _ in range(5)]
+        self.assertEqual([round(backoff, 2) for backoff in backoffs], [0.15, 0.45, 1.35, 2.0, 2.0])
+
+
+class TestRetryOnConflict(unittest.TestCase):
+    """Tests for retry_on_conflict"""
+
+    def setUp(self):
+        """Set up mocks."""
+        self.mock_sleep = patch('cray_product_catalog.util.k8s.time.sleep').start()
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_no_conflict(self):
+        """Test that the function is called once and not delayed if there is no conflict"""
+        func = Mock(return_value=True)
+        self.assertTrue(retry_on_conflict(func))
+        func.assert_called_once_with()
+        self.mock_sleep.assert_not_called()
+
+    def test_conflict_then_success(self):
+        """Test that the function is retried with increasing backoff after a conflict"""
+        func = Mock(side_effect=[ApiException(status=409), ApiException(status=409), True])
+        with self.assertLogs(level='WARNING'):
+            self.assertTrue(retry_on_conflict(func, base=0.1, cap=1.0))
+        self.assertEqual(func.call_count, 3)
+        first_backoff, second_backoff = (args[0] for args, _ in self.mock_sleep.call_args_list)
+        self.assertTrue(0.1 <= first_backoff <= 0.3)
+        self.assertTrue(0.1 <= second_backoff <= min(1.0, first_backoff * 3))
+
+    def test_conflict_every_attempt(self):
+        """Test that the conflict is raised once all attempts are exhausted"""
+        func = Mock(side_effect=ApiException(status=409))
+        with self.assertLogs(level='WARNING'):
+            with self.assertRaises(ApiException):
+                retry_on_conflict(func, steps=3)
+        self.assertEqual(func.call_count, 3)
+
+    def test_other_error(self):
+        """Test that errors other than conflicts are raised immediately"""
+        func = Mock(side_effect=ApiException(status=500))
+        with self.assertRaises(ApiException):
+            retry_on_conflict(func)
+        func.assert_called_once_with()
+        self.mock_sleep.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
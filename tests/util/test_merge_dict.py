@@ -1,6 +1,6 @@
 # MIT License
 #
-# (C) Copyright 2022-2023 Hewlett Packard Enterprise Development LP
+# (C) Copyright 2022-2026 Hewlett Packard Enterprise Development LP
 #
 # Permission is hereby granted, free of charge, to any person obtaining a
 # copy of this software and associated documentation files (the "Software"),
@@ -28,7 +28,7 @@ Unit tests for the cray_product_catalog.util.merge_dict module
 from copy import deepcopy
 import unittest
 
-from cray_product_catalog.util.merge_dict import merge_dict
+from cray_product_catalog.util.merge_dict import merge_dict, merge_dict_into
 
 from tests.util.mocks import (
     COMPLICATED_INPUT_DICT,
@@ -96,3 +96,18 @@ class TestMergeDict(unittest.TestCase):
         expected = PRODUCT_CATALOG_EXPECTED_MERGE
         actual = merge_dict(input_dict, PRODUCT_CATALOG_EXISTING_DATA)
         self.assertEqual(expected, actual)
+
+
+class TestMergeDictInto(unittest.TestCase):
+    """Tests for merge_dict_into."""
+
+    def test_complicated_merge_dict_into(self):
+        """Test merge_dict_into gives the same result as merge_dict, in place."""
+        existing_dict = deepcopy(COMPLICATED_EXISTING_DICT)
+        self.assertIsNone(merge_dict_into(COMPLICATED_INPUT_DICT, existing_dict))
+        self.assertEqual(COMPLICATED_EXPECTED_MERGE, existing_dict)
+
+    def test_merge_dict_into_unexpected_types(self):
+        """Test merge_dict_into raises TypeError if the arguments are not dicts."""
+        with self.assertRaises(TypeError):
+            merge_dict_into({'key': 'value'}, None)
@@ -0,0 +1,68 @@
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+
+"""
+Unit tests for the cray_product_catalog.util.yaml_helper module
+"""
+
+import io
+import unittest
+
+import yaml
+
+from cray_product_catalog.util.yaml_helper import compose_yaml, dump_yaml, load_yaml, serialize_yaml
+
+
+class TestYamlHelper(unittest.TestCase):
+    """Tests for load_yaml and dump_yaml."""
+
+    def test_round_trip(self):
+        """Test that data dumped with dump_yaml is loaded back unchanged."""
+        data = {'1.0.0': {'component_versions': {'docker': [{'name': 'foo', 'version': '1.0.0'}]}}}
+        self.assertEqual(load_yaml(dump_yaml(data)), data)
+
+    def test_dump_block_style(self):
+        """Test that dump_yaml uses block style."""
+        self.assertEqual(dump_yaml({'a': {'b': 'c'}}), 'a:\n  b: c\n')
+
+    def test_load_from_file(self):
+        """Test that load_yaml loads from a file object."""
+        self.assertEqual(load_yaml(io.StringIO('a: 1\n')), {'a': 1})
+
+    def test_load_unsafe_tag(self):
+        """Test that load_yaml does not construct arbitrary Python objects."""
+        with self.assertRaises(yaml.YAMLError):
+            load_yaml('!!python/object/apply:os.system ["true"]')
+
+    def test_compose_serialize_round_trip(self):
+        """Test that a composed graph is serialized back to equivalent YAML."""
+        text = 'a:\n  b: [1, 2]\n  c: 2023-02-28 04:37:34.914586\n'
+        self.assertEqual(load_yaml(serialize_yaml(compose_yaml(text))), load_yaml(text))
+
+    def test_compose_empty(self):
+        """Test that compose_yaml returns None for an empty stream."""
+        self.assertIsNone(compose_yaml(''))
+
+
+if __name__ == '__main__':
+    unittest.main()